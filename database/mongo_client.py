@@ -2,11 +2,47 @@ import certifi
 from pymongo import MongoClient
 import logging
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Dict, List, Optional
 from bson import ObjectId
 
 logger = logging.getLogger(__name__)
 
+# Connection pool and timeout settings shared by every client of this project
+POOL_OPTIONS = {
+    "maxPoolSize": 50,
+    "minPoolSize": 5,
+    "serverSelectionTimeoutMS": 15000,
+    "connectTimeoutMS": 2000,
+    "socketTimeoutMS": 60000,
+    "retryWrites": True,
+    "appname": "job_scraper",
+}
+
+_clients: Dict[str, MongoClient] = {}
+
+
+def client_options(uri: str) -> Dict:
+    """MongoClient keyword arguments for ``uri``: pool settings plus TLS"""
+    options = dict(POOL_OPTIONS)
+    # Detect if we should use TLS (default for Atlas, maybe not for local)
+    if "localhost" not in uri and "127.0.0.1" not in uri:
+        options["tls"] = True
+        options["tlsCAFile"] = certifi.where()
+    else:
+        options["tls"] = False
+    return options
+
+
+def get_client(uri: str) -> MongoClient:
+    """Return a pooled MongoClient for ``uri``, shared within the process"""
+    if not uri:
+        raise ValueError("MONGO_URI not found in environment variables")
+    client = _clients.get(uri)
+    if client is None:
+        client = MongoClient(uri, **client_options(uri))
+        _clients[uri] = client
+    return client
+
 
 class MongoDBClient:
     def __init__(self, uri: str, database: str):
@@ -14,24 +50,9 @@ class MongoDBClient:
             logger.error("MONGO_URI is not set in environment!")
             raise ValueError("MONGO_URI not found in environment variables")
 
+        self.uri = uri
         try:
-            # Detect if we should use TLS (default for Atlas, maybe not for local)
-            use_tls = "localhost" not in uri and "127.0.0.1" not in uri
-
-            # For debugging SSL errors on macOS
-            connection_args = {
-                "connectTimeoutMS": 10000,
-                "socketTimeoutMS": 10000,
-                "serverSelectionTimeoutMS": 10000,
-            }
-
-            if use_tls:
-                connection_args["tls"] = True
-                connection_args["tlsCAFile"] = certifi.where()
-            else:
-                connection_args["tls"] = False
-
-            self.client = MongoClient(uri, **connection_args)
+            self.client = get_client(uri)
             # Trigger connection
             self.client.admin.command("ping")
             self.db = self.client[database]
@@ -121,5 +142,23 @@ class MongoDBClient:
             # Likely duplicate link
             return None
 
+    def set_job_location(self, job_ids: List[ObjectId], geo: Dict):
+        """Store geocoded coordinates on jobs that were saved without them"""
+        self.jobs.update_many(
+            {"_id": {"$in": job_ids}},
+            {
+                "$set": {
+                    "location_geo": {
+                        "type": "Point",
+                        "coordinates": [geo["lng"], geo["lat"]],
+                    },
+                    "formatted_address_verified": geo["formatted_address"],
+                }
+            },
+        )
+
     def close(self):
         self.client.close()
+        # A closed client can't be handed out again
+        if _clients.get(self.uri) is self.client:
+            del _clients[self.uri]
@@ -1,14 +1,13 @@
 import os
-import certifi
-from pymongo import MongoClient
 from datetime import datetime
 from dotenv import load_dotenv
+from database.mongo_client import get_client
 
 # Load env from parent directory (backend) or current
 load_dotenv('../backend/.env')
 
 uri = os.getenv('MONGODB_URI')
-client = MongoClient(uri, tls=True, tlsCAFile=certifi.where())
+client = get_client(uri)
 db = client.get_database()
 jobs_col = db.jobs
 
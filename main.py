@@ -1,12 +1,15 @@
 #!/usr/bin/env python3
 import os
+import re
 import sys
-from bs4 import BeautifulSoup
 import logging
+import pytz
 import asyncio
 import argparse
 from datetime import datetime, date
+from functools import lru_cache
 from dotenv import load_dotenv
+from lxml import etree, html as lxml_html
 
 from database.mongo_client import MongoDBClient
 from ai.categorizer import JobCategorizer
@@ -14,6 +17,7 @@ from utils.deduplicator import JobDeduplicator
 from utils.geocoding import Geocoder
 from utils.description_fetcher import DescriptionFetcher
 from markdownify import markdownify as md
+from scrapers.base_scraper import BaseScraper
 from scrapers.adzuna_scraper import AdzunaScraper
 from scrapers.rss_scraper import RSSScraper
 from scrapers.jobisjob_scraper import JobisJobScraper
@@ -40,6 +44,37 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Non-ISO formats seen in feeds, tried in order after the ISO fast path
+DATE_FORMATS = (
+    "%Y-%m-%dT%H:%M:%SZ",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%d %H:%M:%S",
+    "%a, %d %b %Y %H:%M:%S %z",
+    "%a, %d %b %Y %H:%M:%S %Z",
+    "%Y-%m-%d",
+    "%d %b %Y",
+)
+
+
+@lru_cache(maxsize=1024)
+def _parse_date_string(value: str):
+    """Parse a date string into a naive datetime, or None. Cached per string."""
+    # ISO 8601 (the common case) is parsed in C without trying each format
+    try:
+        dt = datetime.fromisoformat(value)
+    except ValueError:
+        dt = None
+        for fmt in DATE_FORMATS:
+            try:
+                dt = datetime.strptime(value, fmt)
+                break
+            except ValueError:
+                continue
+
+    if dt is not None and dt.tzinfo:
+        dt = dt.replace(tzinfo=None)
+    return dt
+
 
 class JobScraperOrchestrator:
     def __init__(self, languages=None, limit_per_language=None, days_window=1):
@@ -50,9 +85,19 @@ class JobScraperOrchestrator:
             api_key=os.getenv("OPENAI_API_KEY"),
             model=os.getenv("OPENAI_MODEL", "gpt-4o-mini"),
         )
-        self.geocoder = Geocoder(api_key=os.getenv("GOOGLE_MAPS_API_KEY"))
+        self.geocoder = Geocoder(
+            api_key=os.getenv("GOOGLE_MAPS_API_KEY"),
+            cache_path=os.getenv("GEOCODE_CACHE_PATH", ".cache/geocode.sqlite"),
+        )
+        # Address -> IDs of jobs saved without coordinates because the
+        # geocoding quota was exceeded; filled in at the end of the run
+        self.ungeocoded_jobs = {}
         self.deduplicator = JobDeduplicator(self.db_client)
-        self.description_fetcher = DescriptionFetcher()
+        self.description_fetcher = DescriptionFetcher(
+            cache_path=os.getenv(
+                "DESCRIPTION_CACHE_PATH", ".cache/descriptions.sqlite"
+            )
+        )
         self.days_window = days_window
 
         # ... (imports)
@@ -126,6 +171,10 @@ class JobScraperOrchestrator:
             "sviluppatore",
             "laravel",
         ]
+        # All keywords in one case-insensitive alternation, matched in one scan
+        self._keywords_re = re.compile(
+            "|".join(re.escape(k) for k in self.keywords), re.IGNORECASE
+        )
 
         # Statistics tracking
         self.stats = {}
@@ -147,23 +196,9 @@ class JobScraperOrchestrator:
 
         if isinstance(pub_date, str):
             pub_date = pub_date.strip()
-            fmts = [
-                "%Y-%m-%dT%H:%M:%SZ",
-                "%Y-%m-%dT%H:%M:%S",
-                "%Y-%m-%d %H:%M:%S",
-                "%a, %d %b %Y %H:%M:%S %z",
-                "%a, %d %b %Y %H:%M:%S %Z",
-                "%Y-%m-%d",
-                "%d %b %Y",
-            ]
-            for fmt in fmts:
-                try:
-                    dt = datetime.strptime(pub_date, fmt)
-                    if dt.tzinfo:
-                        dt = dt.replace(tzinfo=None)
-                    return dt
-                except ValueError:
-                    continue
+            dt = _parse_date_string(pub_date)
+            if dt is not None:
+                return dt
 
             # Fallback: check if the string contains today's date in YYYY-MM-DD format
             today_str = date.today().strftime("%Y-%m-%d")
@@ -189,13 +224,67 @@ class JobScraperOrchestrator:
         """Check if job title matches our target keywords"""
         if not title:
             return False
-        title_lower = title.lower()
-        for k in self.keywords:
-            if k.lower() in title_lower:
-                return True
-        return False
+        return self._keywords_re.search(title) is not None
+
+    async def prefetch_descriptions(self, jobs, limit=None):
+        """
+        Fetch full descriptions for the short-snippet jobs that will pass the
+        cheap filters, concurrently, up to `limit` of them (the rest are
+        fetched on demand). Returns a dict of link -> fetch result.
+        """
+        urls = [
+            job["link"]
+            for job in jobs
+            if job.get("link")
+            and len(job.get("description") or "") < 500
+            and self.is_relevant_job(job.get("title", ""))
+            and self.is_published_today(
+                job.get("published_at"), days_window=self.days_window
+            )
+        ]
+        if limit is not None:
+            urls = urls[:limit]
+        if not urls:
+            return {}
+
+        logger.info(f"Fetching {len(urls)} full descriptions concurrently")
+        results = await self.description_fetcher.fetch_many(urls)
+        return dict(zip(urls, results))
+
+    async def retry_deferred_geocodes(self):
+        """
+        Geocode again the addresses that were over quota during the run, and
+        store the coordinates on the jobs saved without them.
+        """
+        addresses = list(self.geocoder.deferred)
+        if not addresses:
+            return
+
+        logger.info(f"Retrying {len(addresses)} deferred geocoding lookups")
+        results = await self.geocoder.get_coordinates_many(addresses)
+        for address, geo in zip(addresses, results):
+            job_ids = self.ungeocoded_jobs.pop(address, None)
+            if geo and job_ids:
+                try:
+                    self.db_client.set_job_location(job_ids, geo)
+                except Exception as e:
+                    logger.error(f"Could not update coordinates for {address}: {e}")
 
     async def process_job_list(self, jobs, lang, lang_count):
+        # 1. Deduplicate the whole list with one DB query, before any fetching
+        new_jobs = self.deduplicator.filter_new(jobs)
+        if len(new_jobs) < len(jobs):
+            logger.debug(f"Skipping {len(jobs) - len(new_jobs)} duplicate jobs")
+        jobs = new_jobs
+
+        # No more jobs than the language still has room for can be imported
+        remaining = (
+            max(self.limit_per_language - lang_count, 0)
+            if self.limit_per_language
+            else None
+        )
+        descriptions = await self.prefetch_descriptions(jobs, limit=remaining)
+
         for job in jobs:
             if self.limit_per_language and lang_count >= self.limit_per_language:
                 break
@@ -217,8 +306,6 @@ class JobScraperOrchestrator:
                 continue
 
             # Ensure published_at is a datetime object for the database
-            import pytz
-
             job["published_at"] = self.parse_date(pub_date_raw) or datetime.now(
                 pytz.utc
             )
@@ -228,11 +315,14 @@ class JobScraperOrchestrator:
             is_markdown = False
 
             if not desc or len(desc) < 500:
-                logger.info(f"Fetching full description for: {job['title']}")
                 try:
-                    full_desc, extracted_logo = await self.description_fetcher.fetch(
-                        job["link"]
-                    )
+                    result = descriptions.get(job["link"])
+                    if result is None:
+                        logger.info(f"Fetching full description for: {job['title']}")
+                        result = await self.description_fetcher.fetch(job["link"])
+                    elif isinstance(result, Exception):
+                        raise result
+                    full_desc, extracted_logo = result
                     if full_desc:
                         job["description"] = full_desc
                         is_markdown = True
@@ -266,17 +356,18 @@ class JobScraperOrchestrator:
             # Ensure description is Markdown (if it was HTML)
             if job.get("description") and not is_markdown:
                 # Check if it actually looks like HTML to avoid escaping plain text/markdown
-                soup = BeautifulSoup(job["description"], "html.parser")
-                if bool(soup.find()):
+                try:
+                    root = lxml_html.fragment_fromstring(
+                        job["description"], create_parent="div"
+                    )
+                except (etree.ParserError, ValueError):
+                    root = None
+                if root is not None and len(root):
                     # Strip all images before converting to markdown
-                    for img in soup.find_all("img"):
-                        img.decompose()
-                    job["description"] = md(str(soup))
-
-            # 1. Deduplicate
-            if self.deduplicator.is_duplicate(job):
-                logger.debug(f"Skipping job (duplicate): {job['title']}")
-                continue
+                    etree.strip_elements(root, "img", with_tail=False)
+                    job["description"] = md(
+                        lxml_html.tostring(root, encoding="unicode")
+                    )
 
             # 2. AI Categorize
             logger.info(f"Processing job: {job['title']}")
@@ -342,7 +433,10 @@ class JobScraperOrchestrator:
                     geo_address = ", ".join(parts)
 
                 if geo_address:
-                    geo = self.geocoder.get_coordinates(geo_address)
+                    # In a thread: quota backoff sleeps would block the loop
+                    geo = await asyncio.to_thread(
+                        self.geocoder.get_coordinates, geo_address
+                    )
                     if geo:
                         job["location_geo"] = {
                             "type": "Point",
@@ -371,6 +465,15 @@ class JobScraperOrchestrator:
                 # 7. Save Job
                 inserted_id = self.db_client.insert_job(job)
                 if inserted_id:
+                    self.deduplicator.add(job["link"])
+                    if (
+                        geo_address
+                        and not job.get("location_geo")
+                        and geo_address in self.geocoder.deferred
+                    ):
+                        self.ungeocoded_jobs.setdefault(geo_address, []).append(
+                            inserted_id
+                        )
                     logger.info(
                         f"✅ IMPORTED: ID={inserted_id} | Title={job.get('title')} | Source={job.get('source')}"
                     )
@@ -486,6 +589,14 @@ class JobScraperOrchestrator:
                     except Exception as e:
                         logger.error(f"Error in keyword scraper loop: {e}")
 
+        # Release pooled HTTP connections held by the async scrapers
+        for scraper in self.scrapers:
+            if isinstance(scraper, BaseScraper):
+                await scraper.close()
+        await self.description_fetcher.close()
+        await self.retry_deferred_geocodes()
+        self.geocoder.close()
+
         self.db_client.close()
         self.db_client.close()
         logger.info("Job scraper run finished.")
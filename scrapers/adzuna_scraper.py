@@ -1,4 +1,3 @@
-import requests
 import logging
 from typing import List, Dict
 from .base_scraper import BaseScraper
@@ -50,7 +49,7 @@ class AdzunaScraper(BaseScraper):
             return []
 
         try:
-            response = requests.get(url, params=params, timeout=10)
+            response = self.requests_session.get(url, params=params, timeout=10)
             response.raise_for_status()
             data = response.json()
 
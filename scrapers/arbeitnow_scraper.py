@@ -29,7 +29,7 @@ class ArbeitnowScraper(BaseScraper):
             for attempt in range(max_retries):
                 time.sleep(5)
                 try:
-                    response = requests.get(self.api_url, headers=headers, timeout=10)
+                    response = self.requests_session.get(self.api_url, headers=headers, timeout=10)
 
                     if response.status_code == 429:
                         retry_after = int(response.headers.get("Retry-After", 60))
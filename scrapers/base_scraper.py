@@ -1,15 +1,92 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict
-from bs4 import BeautifulSoup
+from contextlib import asynccontextmanager
+from typing import List, Dict, Optional
+from lxml import etree, html as lxml_html
+import aiohttp
+import html
 import logging
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from utils.rate_limited_fetcher import RateLimitedFetcher
 
 logger = logging.getLogger(__name__)
 
+# Images, media and embedded code removed from descriptions, with their content
+_MEDIA_TAGS = (
+    "img",
+    "svg",
+    "figure",
+    "picture",
+    "video",
+    "audio",
+    "iframe",
+    "object",
+    "embed",
+    "script",
+    "style",
+)
+
 class BaseScraper(ABC):
+    # Pooled keep-alive session, created lazily inside the running event loop
+    _session: Optional[aiohttp.ClientSession] = None
+    # Shared by all scrapers so per-host budgets apply across sources
+    _fetcher = RateLimitedFetcher()
+    # Keep-alive session for scrapers that still use blocking requests
+    _requests_session: Optional[requests.Session] = None
+
     @abstractmethod
     async def scrape(self, keyword: str, lang: str) -> List[Dict]:
         pass
 
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared HTTP session, creating it on first use."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=64, limit_per_host=8, keepalive_timeout=30
+                )
+            )
+        return self._session
+
+    @asynccontextmanager
+    async def _get(self, url: str, **kwargs):
+        """Rate-limited, retrying GET over the pooled session."""
+        session = await self._get_session()
+        async with self._fetcher.get(session, url, **kwargs) as response:
+            yield response
+
+    @property
+    def requests_session(self) -> requests.Session:
+        """Pooled requests.Session with retries on 5xx, created on first use."""
+        if self._requests_session is None:
+            session = requests.Session()
+            # 429 is left out of the adapter's retries: scrapers handle it
+            # themselves, with their own wait and attempt limits
+            adapter = HTTPAdapter(
+                pool_connections=10,
+                pool_maxsize=100,
+                max_retries=Retry(
+                    total=3,
+                    backoff_factor=0.5,
+                    status_forcelist=[500, 502, 503, 504],
+                    raise_on_status=False,
+                ),
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            self._requests_session = session
+        return self._requests_session
+
+    async def close(self):
+        """Close the pooled HTTP sessions, if any were opened."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        if self._requests_session is not None:
+            self._requests_session.close()
+            self._requests_session = None
+
     def clean_description(self, text: str) -> str:
         """
         Sanitize description to remove images and potentially unsafe/unwanted tags 
@@ -23,17 +100,16 @@ class BaseScraper(ABC):
             if not ("<" in text and ">" in text):
                 return text
 
-            soup = BeautifulSoup(text, "html.parser")
-            
-            # Remove images and media
-            for tag in soup.find_all(["img", "svg", "figure", "picture", "video", "audio", "iframe", "object", "embed", "script", "style"]):
-                tag.decompose()
-                
-            # Remove elements with v: prefixes (VML) often found in RSS
-            # BeautifulSoup with html.parser might handle namespaces poorly, but we can try to catch common ones
-            # or just iterate all and check name
-            
-            return str(soup)
+            root = lxml_html.fragment_fromstring(text, create_parent="div")
+
+            # Remove images and media in a single pass over the tree
+            etree.strip_elements(root, *_MEDIA_TAGS, with_tail=False)
+
+            # Serialize the children only, dropping the wrapper div. The
+            # leading text is re-escaped as tostring() does for the rest.
+            return html.escape(root.text or "", quote=False) + "".join(
+                lxml_html.tostring(child, encoding="unicode") for child in root
+            )
         except Exception as e:
             logger.warning(f"Error cleaning description: {e}")
             return text
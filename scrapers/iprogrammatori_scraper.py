@@ -1,4 +1,3 @@
-import requests
 import logging
 from bs4 import BeautifulSoup
 from typing import List, Dict
@@ -23,7 +22,7 @@ class IProgrammatoriScraper(BaseScraper):
             headers = {
                 "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
             }
-            response = requests.get(self.feed_url, headers=headers, timeout=10)
+            response = self.requests_session.get(self.feed_url, headers=headers, timeout=10)
             response.raise_for_status()
 
             # The feed is XML
@@ -1,4 +1,3 @@
-import requests
 import logging
 from typing import List, Dict
 from .base_scraper import BaseScraper
@@ -42,7 +41,7 @@ class JobicyScraper(BaseScraper):
 
             time.sleep(1)
 
-            response = requests.get(
+            response = self.requests_session.get(
                 self.BASE_URL, params=params, headers=headers, timeout=15
             )
             response.raise_for_status()
@@ -1,4 +1,3 @@
-import requests
 from bs4 import BeautifulSoup
 import logging
 from datetime import datetime
@@ -38,7 +37,7 @@ class JobisJobScraper(BaseScraper):
         }
         
         try:
-            response = requests.get(url, headers=headers, timeout=10)
+            response = self.requests_session.get(url, headers=headers, timeout=10)
             soup = BeautifulSoup(response.content, 'html.parser')
             
             job_cards = soup.select('div.offer')
@@ -1,4 +1,3 @@
-import requests
 import logging
 import os
 from datetime import datetime, timedelta
@@ -56,7 +55,7 @@ class JoobleScraper(BaseScraper):
 
             urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
-            response = requests.post(
+            response = self.requests_session.post(
                 url, json=payload, headers=headers, timeout=10, verify=False
             )
 
@@ -7,25 +7,35 @@ authentication or cookies. It returns HTML which is parsed using BeautifulSoup.
 No external API services or subscriptions required - 100% free.
 """
 
-import requests
+import aiohttp
+import asyncio
 import logging
 import time
 import re
+from types import MappingProxyType
 from typing import List, Dict, Optional
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+from lxml import etree, html as lxml_html
+from markdownify import MarkdownConverter
 from .base_scraper import BaseScraper
 
 logger = logging.getLogger(__name__)
 
-
-class LinkedInScraper(BaseScraper):
-    """Scraper for LinkedIn Jobs using public guest API (no auth required)."""
-
-    BASE_URL = "https://www.linkedin.com/jobs-guest/jobs/api/seeMoreJobPostings/search"
-    JOB_DETAIL_URL = "https://www.linkedin.com/jobs-guest/jobs/api/jobPosting/{job_id}"
-
-    # Map language codes to LinkedIn location strings
-    LOCATION_MAP = {
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,"
+    "image/webp,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.5",
+    # No "br": aiohttp can only decode brotli when the brotli package is installed
+    "Accept-Encoding": "gzip, deflate",
+    "Connection": "keep-alive",
+}
+
+# Map language codes to LinkedIn location strings
+LOCATION_MAP = MappingProxyType(
+    {
         "en": "United States",
         "it": "Italy",
         "es": "Spain",
@@ -33,6 +43,64 @@ class LinkedInScraper(BaseScraper):
         "de": "Germany",
         "gb": "United Kingdom",
     }
+)
+_DEFAULT_LOCATION = LOCATION_MAP["en"]
+
+_URN_RE = re.compile(r"jobPosting:(\d+)")
+# Only job cards are materialized when parsing search results. The class is
+# matched as a token because the strainer sees the raw attribute string.
+_JOB_CARD_STRAINER = SoupStrainer(
+    "div", class_=re.compile(r"(?:^|\s)base-card(?:\s|$)")
+)
+_BLANK_LINES_RE = re.compile(r"\n\s*\n")
+
+# Keywords flagging a listing as remote, compiled into one alternation so all
+# of them are matched in a single scan of the text
+REMOTE_KEYWORDS = ("remote", "remoto", "télétravail", "homeoffice", "home office")
+_REMOTE_RE = re.compile(
+    "|".join(re.escape(kw) for kw in REMOTE_KEYWORDS), re.IGNORECASE
+)
+
+
+def _has_class(name: str) -> str:
+    """XPath predicate matching an exact token of the class attribute."""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+_DESCRIPTION_XPATH = etree.XPath(f"//div[{_has_class('description__text')}]")
+_CRITERIA_XPATH = etree.XPath(
+    f"//li[{_has_class('description__job-criteria-item')}]"
+)
+# Widgets LinkedIn embeds in the description markup, removed in a single pass
+_DESCRIPTION_NOISE_XPATH = etree.XPath(
+    ".//*[contains(@class, 'show-more-less-html__button')"
+    " or contains(@class, 'find-a-referral__cta-container')"
+    " or contains(@class, 'job-details-how-to-apply')"
+    " or contains(@class, 'similar-jobs')"
+    " or contains(@class, 'contextual-sign-in-modal')"
+    " or contains(@class, 'job-alert-redirect-section')"
+    " or self::button]"
+)
+# Boilerplate sentences LinkedIn injects as plain text nodes
+_NOISE_TEXT_RE = re.compile(
+    r"(?:show more|show less|see who .+ has hired|"
+    r"referrals increase your chances|get notified about new|sign in to)",
+    re.IGNORECASE,
+)
+
+
+def _element_text(element, separator: str = "") -> str:
+    """Equivalent of BeautifulSoup's get_text(separator, strip=True)."""
+    return separator.join(
+        text.strip() for text in element.itertext() if text.strip()
+    )
+
+
+class LinkedInScraper(BaseScraper):
+    """Scraper for LinkedIn Jobs using public guest API (no auth required)."""
+
+    BASE_URL = "https://www.linkedin.com/jobs-guest/jobs/api/seeMoreJobPostings/search"
+    JOB_DETAIL_URL = "https://www.linkedin.com/jobs-guest/jobs/api/jobPosting/{job_id}"
 
     def __init__(self, max_results: int = 25, fetch_details: bool = False):
         """
@@ -44,16 +112,8 @@ class LinkedInScraper(BaseScraper):
         """
         self.max_results = max_results
         self.fetch_details = fetch_details
-        self.headers = {
-            "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/120.0.0.0 Safari/537.36",
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,"
-            "image/webp,*/*;q=0.8",
-            "Accept-Language": "en-US,en;q=0.5",
-            "Accept-Encoding": "gzip, deflate, br",
-            "Connection": "keep-alive",
-        }
+        # Reused for every job detail instead of rebuilding options per call
+        self._markdown = MarkdownConverter()
 
     async def scrape(self, keyword: str, lang: str) -> List[Dict]:
         """
@@ -66,7 +126,7 @@ class LinkedInScraper(BaseScraper):
         Returns:
             List of job dictionaries in internal format
         """
-        location = self.LOCATION_MAP.get(lang, self.LOCATION_MAP["en"])
+        location = LOCATION_MAP.get(lang) or _DEFAULT_LOCATION
 
         params = {
             "keywords": keyword,
@@ -75,20 +135,30 @@ class LinkedInScraper(BaseScraper):
         }
 
         try:
-            response = requests.get(
+            async with self._get(
                 self.BASE_URL,
                 params=params,
-                headers=self.headers,
-                timeout=15,
-            )
-            response.raise_for_status()
+                headers=HEADERS,
+                timeout=aiohttp.ClientTimeout(total=15),
+            ) as response:
+                response.raise_for_status()
+                # Explicit charset (UTF-8 when undeclared) skips charset sniffing
+                html = await response.text(encoding=response.charset or "utf-8")
 
-            jobs = self._parse_job_listings(response.text, lang)
+            jobs = self._parse_job_listings(html, lang)
 
             logger.info(
                 f"LinkedIn scraper found {len(jobs)} jobs for '{keyword}' in {location}"
             )
-            return jobs[: self.max_results]
+            jobs = jobs[: self.max_results]
+
+            if self.fetch_details:
+                details = await self.fetch_many([job["external_id"] for job in jobs])
+                for job, detail in zip(jobs, details):
+                    if detail and detail.get("description"):
+                        job["description"] = detail["description"]
+
+            return jobs
 
         except Exception as e:
             logger.error(f"Error scraping LinkedIn: {e}")
@@ -96,15 +166,16 @@ class LinkedInScraper(BaseScraper):
 
     def _parse_job_listings(self, html: str, lang: str) -> List[Dict]:
         """Parse job listings from HTML response."""
-        soup = BeautifulSoup(html, "html.parser")
+        soup = BeautifulSoup(html, "lxml", parse_only=_JOB_CARD_STRAINER)
         jobs = []
 
         # Find all job cards
         job_cards = soup.find_all("div", class_="base-card")
 
+        parse_card = self._parse_job_card
         for card in job_cards:
             try:
-                job = self._parse_job_card(card, lang)
+                job = parse_card(card, lang)
                 if job:
                     jobs.append(job)
             except Exception as e:
@@ -115,19 +186,33 @@ class LinkedInScraper(BaseScraper):
 
     def _parse_job_card(self, card, lang: str) -> Optional[Dict]:
         """Parse a single job card element."""
+        # Title first: cards without one are rejected before any other lookup
+        title_elem = card.find("h3", class_="base-search-card__title")
+        title = title_elem.get_text(strip=True) if title_elem else None
+
+        if not title:
+            return None
+
         # Extract job URN from data attribute
         job_urn = card.get("data-entity-urn", "")
         job_id = None
         if job_urn:
-            match = re.search(r"jobPosting:(\d+)", job_urn)
+            match = _URN_RE.search(job_urn)
             if match:
                 job_id = match.group(1)
 
-        # Title
-        title_elem = card.find("h3", class_="base-search-card__title")
-        title = title_elem.get_text(strip=True) if title_elem else None
+        # Job link
+        link_elem = card.find("a", class_="base-card__full-link")
+        link = link_elem.get("href") if link_elem else None
 
-        if not title:
+        # Clean up link (remove tracking params)
+        if link:
+            link = link.split("?")[0]
+
+        if not link and job_id:
+            link = f"https://www.linkedin.com/jobs/view/{job_id}/"
+
+        if not link:
             return None
 
         # Company
@@ -152,20 +237,6 @@ class LinkedInScraper(BaseScraper):
             date_elem = card.find("time", class_="job-search-card__listdate--new")
         posted_at = date_elem.get("datetime") if date_elem else None
 
-        # Job link
-        link_elem = card.find("a", class_="base-card__full-link")
-        link = link_elem.get("href") if link_elem else None
-
-        # Clean up link (remove tracking params)
-        if link:
-            link = link.split("?")[0]
-
-        if not link and job_id:
-            link = f"https://www.linkedin.com/jobs/view/{job_id}/"
-
-        if not link:
-            return None
-
         return {
             "title": title,
             "company": {
@@ -184,52 +255,94 @@ class LinkedInScraper(BaseScraper):
 
     def _is_remote(self, title: str, location: str) -> bool:
         """Check if job is remote based on title or location."""
-        remote_keywords = [
-            "remote",
-            "remoto",
-            "télétravail",
-            "homeoffice",
-            "home office",
-        ]
-        text = f"{title} {location}".lower() if location else title.lower()
-        return any(kw in text for kw in remote_keywords)
+        # Title usually carries the signal, so check it before the location
+        if _REMOTE_RE.search(title):
+            return True
+        return bool(location) and _REMOTE_RE.search(location) is not None
+
+    async def fetch_many(
+        self, job_ids: List[Optional[str]], concurrency: int = 8
+    ) -> List[Optional[Dict]]:
+        """
+        Fetch details for many jobs concurrently, at most `concurrency` at a time.
+        Results are returned in the same order as `job_ids`.
+        """
+        sem = asyncio.Semaphore(concurrency)
+        return await asyncio.gather(
+            *[self._fetch_one(sem, job_id) for job_id in job_ids]
+        )
+
+    async def _fetch_one(
+        self, sem: asyncio.Semaphore, job_id: Optional[str]
+    ) -> Optional[Dict]:
+        if not job_id:
+            return None
+        async with sem:
+            return await self.fetch_job_details(job_id)
 
     async def fetch_job_details(self, job_id: str) -> Optional[Dict]:
         """Fetch full job details (description, requirements, etc.)."""
         url = self.JOB_DETAIL_URL.format(job_id=job_id)
 
         try:
-            response = requests.get(url, headers=self.headers, timeout=10)
-            if response.status_code != 200:
-                return None
-
-            soup = BeautifulSoup(response.text, "html.parser")
-
-            # Extract description
-            desc_elem = soup.find("div", class_="description__text")
-            description = ""
-            if desc_elem:
-                # Convert to text preserving some structure
-                description = desc_elem.get_text(separator="\n", strip=True)
-
-            # Extract criteria
-            criteria = {}
-            criteria_list = soup.find_all("li", class_="description__job-criteria-item")
-            for item in criteria_list:
-                header = item.find("h3")
-                value = item.find("span")
-                if header and value:
-                    key = header.get_text(strip=True).lower().replace(" ", "_")
-                    criteria[key] = value.get_text(strip=True)
-
-            return {
-                "description": description,
-                "seniority": criteria.get("seniority_level"),
-                "employment_type": criteria.get("employment_type"),
-                "job_function": criteria.get("job_function"),
-                "industries": criteria.get("industries"),
-            }
+            async with self._get(
+                url,
+                headers=HEADERS,
+                timeout=aiohttp.ClientTimeout(total=10),
+            ) as response:
+                if response.status != 200:
+                    return None
+                # Explicit charset (UTF-8 when undeclared) skips charset sniffing
+                html = await response.text(encoding=response.charset or "utf-8")
+
+            # Parsing and Markdown conversion are CPU-bound; run them in a
+            # worker thread so other fetches keep progressing meanwhile
+            return await asyncio.to_thread(self._parse_job_details, html)
 
         except Exception as e:
             logger.warning(f"Error fetching job details for {job_id}: {e}")
             return None
+
+    def _parse_job_details(self, html: str) -> Dict:
+        """Extract description (as Markdown) and criteria from a job page."""
+        root = lxml_html.document_fromstring(html)
+
+        # Extract description
+        description = ""
+        desc_elems = _DESCRIPTION_XPATH(root)
+        if desc_elems:
+            desc_elem = desc_elems[0]
+            for node in _DESCRIPTION_NOISE_XPATH(desc_elem):
+                node.drop_tree()
+            # Single walk with one combined pattern for boilerplate text
+            noisy = [
+                node
+                for node in desc_elem.iterdescendants()
+                if isinstance(node.tag, str)
+                and node.text
+                and _NOISE_TEXT_RE.match(node.text.strip())
+            ]
+            for node in noisy:
+                node.drop_tree()
+            # Convert to Markdown, like descriptions from DescriptionFetcher
+            markdown = self._markdown.convert(
+                lxml_html.tostring(desc_elem, encoding="unicode")
+            )
+            description = _BLANK_LINES_RE.sub("\n\n", markdown).strip()
+
+        # Extract criteria
+        criteria = {}
+        for item in _CRITERIA_XPATH(root):
+            header = item.find(".//h3")
+            value = item.find(".//span")
+            if header is not None and value is not None:
+                key = _element_text(header).lower().replace(" ", "_")
+                criteria[key] = _element_text(value)
+
+        return {
+            "description": description,
+            "seniority": criteria.get("seniority_level"),
+            "employment_type": criteria.get("employment_type"),
+            "job_function": criteria.get("job_function"),
+            "industries": criteria.get("industries"),
+        }
@@ -1,5 +1,6 @@
-import requests
+import aiohttp
 import logging
+import orjson
 from typing import List, Dict
 from datetime import datetime
 from .base_scraper import BaseScraper
@@ -21,9 +22,11 @@ class RemoteOKScraper(BaseScraper):
         # We will fetch recent jobs and filter client-side for the keyword.
         
         try:
-            response = requests.get(self.api_url, timeout=10)
-            response.raise_for_status()
-            data = response.json()
+            async with self._get(
+                self.api_url, timeout=aiohttp.ClientTimeout(total=10)
+            ) as response:
+                response.raise_for_status()
+                data = orjson.loads(await response.read())
             
             jobs = []
             # First query param is metadata, skip it
@@ -31,16 +34,18 @@ class RemoteOKScraper(BaseScraper):
                 if 'legal' in data[0]:
                     data = data[1:]
             
+            keyword_lc = keyword.lower()
             for item in data:
-                # Filter by keyword in title, description or tags
-                title = item.get('position', '')
+                # Filter by keyword in title or tags
+                title = item.get('position') or ''
+
+                # Check title first and only lowercase the tags when needed
+                if keyword_lc not in title.lower():
+                    tags_lc = tuple(str(tag).lower() for tag in item.get('tags') or ())
+                    if not any(keyword_lc in tag for tag in tags_lc):
+                        continue
+
                 description = item.get('description', '')
-                tags = item.get('tags', [])
-                
-                # Check if keyword matches
-                search_text = (title + " " + " ".join(tags)).lower()
-                if keyword.lower() not in search_text:
-                    continue
                 
                 # Convert date
                 pub_date = item.get('date') # Usually '2023-10-27T...' or generic string
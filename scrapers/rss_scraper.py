@@ -1,6 +1,8 @@
-import requests
+import aiohttp
+import asyncio
 import logging
-from bs4 import BeautifulSoup
+from io import BytesIO
+from lxml import etree
 from typing import List, Dict
 from .base_scraper import BaseScraper
 
@@ -16,46 +18,54 @@ class RSSScraper(BaseScraper):
 
     async def scrape(self, keyword: str, lang: str) -> List[Dict]:
         urls = self.rss_urls.get(lang, [])
-        all_jobs = []
+
+        # Feeds are independent, so fetch them concurrently over the pooled session
+        results = await asyncio.gather(
+            *[self._scrape_feed(url, keyword, lang) for url in urls]
+        )
+        return [job for feed_jobs in results for job in feed_jobs]
+
+    async def _scrape_feed(self, url: str, keyword: str, lang: str) -> List[Dict]:
+        jobs = []
 
         headers = {
             "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
         }
-        for url in urls:
-            try:
-                # Support keyword injection in RSS URL
-                current_url = url.format(keyword=keyword) if "{keyword}" in url else url
-                response = requests.get(current_url, headers=headers, timeout=10)
-                soup = BeautifulSoup(response.content, "xml")
-                items = soup.find_all("item")
-
-                for item in items:
-                    title = item.find("title").text if item.find("title") else ""
-                    if keyword.lower() not in title.lower():
-                        continue
-
-                    all_jobs.append(
+        try:
+            # Support keyword injection in RSS URL
+            current_url = url.format(keyword=keyword) if "{keyword}" in url else url
+            async with self._get(
+                current_url, headers=headers, timeout=aiohttp.ClientTimeout(total=10)
+            ) as response:
+                content = await response.read()
+
+            # Stream <item> elements instead of building the whole feed tree
+            for _, item in etree.iterparse(
+                BytesIO(content), tag="item", recover=True
+            ):
+                title = item.findtext("title", "")
+                if keyword.lower() in title.lower():
+                    jobs.append(
                         {
                             "title": title,
                             "company": {
                                 "name": "Unknown"
                             },  # RSS often lacks company in standard fields
                             "description": self.clean_description(
-                                item.find("description").text
-                                if item.find("description")
-                                else ""
+                                item.findtext("description", "")
                             ),
-                            "link": item.find("link").text if item.find("link") else "",
+                            "link": item.findtext("link", ""),
                             "source": "RSS Feed",
                             "original_language": lang,
-                            "published_at": (
-                                item.find("pubDate").text
-                                if item.find("pubDate")
-                                else None
-                            ),
+                            "published_at": item.findtext("pubDate"),
                         }
                     )
-            except Exception as e:
-                logger.error(f"Error scraping RSS {url}: {e}")
 
-        return all_jobs
+                # Free processed items so memory stays bounded on long feeds
+                item.clear()
+                while item.getprevious() is not None:
+                    del item.getparent()[0]
+        except Exception as e:
+            logger.error(f"Error scraping RSS {url}: {e}")
+
+        return jobs
@@ -1,5 +1,5 @@
 import logging
-import requests
+import aiohttp
 from typing import List, Dict
 from .base_scraper import BaseScraper
 from datetime import datetime
@@ -53,12 +53,19 @@ class TechMapScraper(BaseScraper):
 
         jobs = []
         try:
-            response = requests.get(
-                self.base_url, params=params, headers=headers, timeout=15
-            )
+            async with self._get(
+                self.base_url,
+                params=params,
+                headers=headers,
+                timeout=aiohttp.ClientTimeout(total=15),
+            ) as response:
+                status = response.status
+                if status == 200:
+                    data = await response.json(content_type=None)
+                else:
+                    body = await response.text()
 
-            if response.status_code == 200:
-                data = response.json()
+            if status == 200:
                 # Assuming standard JSON response structure (data or jobs key)
                 # This needs to be adjusted based on actual API response
                 results = data.get("data", [])
@@ -84,14 +91,12 @@ class TechMapScraper(BaseScraper):
                         "currency": item.get("currency"),
                     }
                     jobs.append(job)
-            elif response.status_code == 401:
+            elif status == 401:
                 logger.error("TechMap API Unauthorized. Check your token.")
-            elif response.status_code == 429:
-                logger.warning("TechMap API Rate Limit Exceeded.")
+            elif status == 429:
+                logger.warning("TechMap API Rate Limit Exceeded after retries.")
             else:
-                logger.error(
-                    f"TechMap API Error: {response.status_code} - {response.text}"
-                )
+                logger.error(f"TechMap API Error: {status} - {body}")
 
         except Exception as e:
             logger.error(f"Error scraping TechMap API: {e}")
@@ -1,5 +1,7 @@
 import pytest
-from bs4 import BeautifulSoup
+from concurrent.futures.process import BrokenProcessPool
+from unittest.mock import AsyncMock, Mock, patch
+from lxml import etree, html as lxml_html
 from markdownify import markdownify as md
 import sys
 import os
@@ -8,6 +10,13 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from utils.description_fetcher import DescriptionFetcher
+from utils.html_to_markdown import html_to_markdown
+
+
+async def _chunks(chunks):
+    for chunk in chunks:
+        yield chunk
+
 
 class TestDescriptionProcessing:
     @pytest.fixture
@@ -64,6 +73,119 @@ class TestDescriptionProcessing:
         assert "![" not in markdown
         assert "Banner" not in markdown
 
+    def test_extract_content_stops_at_first_strong_container(self, fetcher):
+        html = f"""
+        <div class="job-description"><p>First. {"Lorem ipsum " * 100}</p></div>
+        <article><p>Second. {"Lorem ipsum " * 200}</p></article>
+        """
+        markdown, logo_url = fetcher._extract_content(html)
+
+        assert "First." in markdown
+        assert "Second." not in markdown
+
+    def test_extract_content_drops_comments_keeps_text(self, fetcher):
+        html = f"""
+        <div class="job-description"><!-- tracking -->Before<!-- x -->After
+            <p>{"Lorem ipsum " * 50}</p>
+        </div>
+        """
+        markdown, _ = fetcher._extract_content(html)
+
+        assert "tracking" not in markdown
+        assert "BeforeAfter" in markdown
+
+    def test_extract_content_reuses_markdown_for_same_container(self, fetcher):
+        container = f'<div class="job-description"><p>Reused. {"Lorem ipsum " * 50}</p></div>'
+        with patch(
+            "utils.description_fetcher.html_to_markdown", wraps=html_to_markdown
+        ) as convert:
+            first = fetcher._extract_content(f"<nav>Page A</nav>{container}")
+            second = fetcher._extract_content(f"<nav>Page B</nav>{container}")
+
+        assert first == second
+        convert.assert_called_once()
+
+    def test_html_to_markdown_block_and_inline_tags(self):
+        root = lxml_html.fragment_fromstring(
+            '<div><h2>Role</h2><p>We use <b>Python </b>and <a href="/jobs">more</a>.</p>'
+            "<ul><li>One</li><li>Two<ul><li>Nested</li></ul></li></ul>"
+            "<ol><li>First</li><li>Second</li></ol><p>snake_case <code>a_b</code></p></div>"
+        )
+        markdown = DescriptionFetcher._clean_markdown(html_to_markdown(root))
+
+        assert markdown == (
+            "## Role\n\n"
+            "We use **Python** and [more](/jobs).\n\n"
+            "- One\n- Two\n  - Nested\n\n"
+            "1. First\n2. Second\n\n"
+            "snake\\_case `a_b`"
+        )
+
+    def test_html_to_markdown_keeps_pre_verbatim(self):
+        root = lxml_html.fragment_fromstring("<div><pre>x  = 1\n  y</pre></div>")
+        assert DescriptionFetcher._clean_markdown(html_to_markdown(root)) == (
+            "```\nx  = 1\n  y\n```"
+        )
+
+    def test_html_to_markdown_keeps_paragraphs_apart_in_list_items(self):
+        root = lxml_html.fragment_fromstring(
+            "<ul><li><p>A</p><p>B</p></li><li>C</li></ul>"
+        )
+        assert DescriptionFetcher._clean_markdown(html_to_markdown(root)) == (
+            "- A\n\n  B\n- C"
+        )
+
+    def test_html_to_markdown_keeps_blocks_inside_list_items(self):
+        root = lxml_html.fragment_fromstring(
+            "<ul><li><h4>Head</h4></li>"
+            "<li><pre>a\n  b</pre></li>"
+            "<li><table><tr><th>S</th></tr><tr><td>5</td></tr></table></li>"
+            "<li><blockquote><p>q</p><p>r</p></blockquote></li></ul>"
+        )
+        assert DescriptionFetcher._clean_markdown(html_to_markdown(root)) == (
+            "- #### Head\n"
+            "- ```\n  a\n    b\n  ```\n"
+            "- | S |\n  | --- |\n  | 5 |\n"
+            "- > q\n  >\n  > r"
+        )
+
+    def test_html_to_markdown_heading_levels_and_list_start(self):
+        root = lxml_html.fragment_fromstring(
+            '<div><h1>Title</h1><h3>Sub</h3><ol start="3"><li>a</li><li>b</li></ol></div>'
+        )
+        assert DescriptionFetcher._clean_markdown(html_to_markdown(root)) == (
+            "## Title\n\n### Sub\n\n3. a\n4. b"
+        )
+
+    def test_html_to_markdown_renders_tables(self):
+        root = lxml_html.fragment_fromstring(
+            "<table><tr><th>Salary</th><th>Place</th></tr>"
+            "<tr><td>50k</td><td>Rome</td></tr></table>"
+        )
+        assert DescriptionFetcher._clean_markdown(html_to_markdown(root)) == (
+            "| Salary | Place |\n| --- | --- |\n| 50k | Rome |"
+        )
+
+    def test_html_to_markdown_keeps_spaces_outside_emphasis(self):
+        root = lxml_html.fragment_fromstring("<p>a<b> x </b>y<i> </i>z</p>")
+        assert DescriptionFetcher._clean_markdown(html_to_markdown(root)) == (
+            "a **x** y z"
+        )
+
+    def test_html_to_markdown_renders_hard_line_breaks(self):
+        root = lxml_html.fragment_fromstring("<p>Line<br>break</p>")
+        assert DescriptionFetcher._clean_markdown(html_to_markdown(root)) == (
+            "Line  \nbreak"
+        )
+
+    def test_html_to_markdown_renders_blockquotes(self):
+        root = lxml_html.fragment_fromstring(
+            "<div><blockquote><p>Quote one</p><p>two</p></blockquote><p>After</p></div>"
+        )
+        assert DescriptionFetcher._clean_markdown(html_to_markdown(root)) == (
+            "> Quote one\n>\n> two\n\nAfter"
+        )
+
     def test_main_loop_html_stripping(self):
         # Semi-unit test for the logic added to main.py
         html_desc = """
@@ -73,12 +195,112 @@ class TestDescriptionProcessing:
         </div>
         """
         
-        soup = BeautifulSoup(html_desc, "html.parser")
-        if bool(soup.find()):
-            for img in soup.find_all("img"):
-                img.decompose()
-            result_md = md(str(soup))
+        root = lxml_html.fragment_fromstring(html_desc, create_parent="div")
+        if len(root):
+            etree.strip_elements(root, "img", with_tail=False)
+            result_md = md(lxml_html.tostring(root, encoding="unicode"))
             
         assert "HTML snippet" in result_md
         assert "![" not in result_md
         assert "image.png" not in result_md
+
+    @pytest.mark.asyncio
+    async def test_extract_cached_skips_repeated_html(self, fetcher):
+        html = f'<div class="job-description"><p>{"Lorem ipsum " * 50}</p></div>'
+        try:
+            first = await fetcher._extract_cached(html)
+            fetcher._pool.shutdown()
+            # A hit must not need the (now shut down) worker pool
+            assert await fetcher._extract_cached(html) == first
+        finally:
+            await fetcher.close()
+
+    @pytest.mark.asyncio
+    async def test_extract_cached_resets_broken_pool(self, fetcher):
+        broken = Mock()
+        broken.submit.side_effect = BrokenProcessPool("worker died")
+        fetcher._pool = broken
+
+        with pytest.raises(BrokenProcessPool):
+            await fetcher._extract_cached("<html></html>")
+
+        broken.shutdown.assert_called_once()
+        assert fetcher._pool is None
+
+    @pytest.mark.asyncio
+    async def test_context_manager_closes_session(self):
+        async with DescriptionFetcher() as fetcher:
+            session = await fetcher._get_session()
+            assert await fetcher._get_session() is session
+
+        assert session.closed
+        assert fetcher._session is None
+
+    @pytest.mark.asyncio
+    async def test_fetch_retries_transient_errors(self, fetcher):
+        throttled = Mock(status=503, headers={"Retry-After": "0"})
+        ok = Mock(status=200, headers={}, charset=None)
+        ok.content.iter_chunked = lambda size: _chunks([b"<html></html>"])
+        session = Mock()
+        session.get = AsyncMock(side_effect=[throttled, ok])
+        fetcher._get_session = AsyncMock(return_value=session)
+        fetcher._extract_cached = AsyncMock(return_value=("Description", None))
+
+        assert await fetcher.fetch("https://example.com/job") == ("Description", None)
+        assert session.get.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_fetch_gives_up_after_max_attempts(self, fetcher):
+        session = Mock()
+        session.get = AsyncMock(
+            return_value=Mock(status=503, headers={"Retry-After": "0"})
+        )
+        fetcher._get_session = AsyncMock(return_value=session)
+
+        assert await fetcher.fetch("https://example.com/job") == (None, None)
+        assert session.get.call_count == 3
+
+    @pytest.mark.asyncio
+    async def test_fetch_caps_page_size(self):
+        fetcher = DescriptionFetcher(max_bytes=8)
+        response = Mock(status=200, headers={}, charset="latin-1")
+        response.content.iter_chunked = lambda size: _chunks([b"caf\xe9", b"12345", b"6"])
+        session = Mock()
+        session.get = AsyncMock(return_value=response)
+        fetcher._get_session = AsyncMock(return_value=session)
+        fetcher._extract_cached = AsyncMock(return_value=("Description", None))
+
+        await fetcher.fetch("https://example.com/job")
+
+        fetcher._extract_cached.assert_called_once_with("caf\xe91234")
+
+    @pytest.mark.asyncio
+    async def test_fetch_falls_back_to_utf8_for_unknown_charset(self, fetcher):
+        response = Mock(status=200, headers={}, charset="x-bogus")
+        response.content.iter_chunked = lambda size: _chunks(["café".encode()])
+        session = Mock()
+        session.get = AsyncMock(return_value=response)
+        fetcher._get_session = AsyncMock(return_value=session)
+        fetcher._extract_cached = AsyncMock(return_value=("Description", None))
+
+        assert await fetcher.fetch("https://example.com/job") == ("Description", None)
+        fetcher._extract_cached.assert_called_once_with("café")
+
+    @pytest.mark.asyncio
+    async def test_fetch_reuses_cached_result_by_url(self, tmp_path):
+        fetcher = DescriptionFetcher(cache_path=str(tmp_path / "cache.sqlite"))
+        response = Mock(status=200, headers={}, charset=None)
+        response.content.iter_chunked = lambda size: _chunks([b"<html></html>"])
+        session = Mock()
+        session.get = AsyncMock(return_value=response)
+        fetcher._get_session = AsyncMock(return_value=session)
+        fetcher._extract_cached = AsyncMock(return_value=("Description", "logo.png"))
+
+        try:
+            first = await fetcher.fetch("https://example.com/job")
+            second = await fetcher.fetch("https://example.com/job")
+        finally:
+            await fetcher.close()
+
+        assert first == second == ("Description", "logo.png")
+        session.get.assert_called_once()
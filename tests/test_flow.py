@@ -30,12 +30,15 @@ async def test_scraper_orchestrator_flow():
         "lng": 12.5,
         "formatted_address": "Rome, Italy",
     }
+    mock_geocoder.deferred = set()
 
     mock_deduplicator = Mock()
-    mock_deduplicator.is_duplicate.return_value = False
+    mock_deduplicator.filter_new.side_effect = lambda jobs: jobs
 
     mock_desc_fetcher = AsyncMock()
-    mock_desc_fetcher.fetch.return_value = "Full job description content..."
+    mock_desc_fetcher.fetch_many.return_value = [
+        ("Full job description content...", None)
+    ]
 
     # Create orchestrator with properly patched dependencies
     with patch("main.MongoDBClient", return_value=mock_db), patch(
@@ -71,14 +74,14 @@ async def test_scraper_orchestrator_flow():
         assert mock_scraper.scrape.called
 
         # Check flow
-        assert mock_deduplicator.is_duplicate.called
+        assert mock_deduplicator.filter_new.called
         assert mock_categorizer.categorize_job.called
         assert mock_geocoder.get_coordinates.called
         assert mock_db.upsert_company.called
         assert mock_db.insert_job.called
 
         # Check that description was fetched (because snippet was short)
-        assert mock_desc_fetcher.fetch.called
+        mock_desc_fetcher.fetch_many.assert_any_call(["http://test.com/job1"])
 
 
 @pytest.mark.asyncio
@@ -89,14 +92,14 @@ async def test_scraper_skips_duplicates():
 
     # We need the INSTANCE to be the mock with the behavior
     mock_dedup_instance = Mock()
-    mock_dedup_instance.is_duplicate.return_value = True  # Always duplicate
+    mock_dedup_instance.filter_new.return_value = []  # Always duplicate
 
     with patch("main.MongoDBClient", return_value=mock_db), patch(
         "main.JobCategorizer"
     ), patch("main.Geocoder"), patch(
         "main.JobDeduplicator", return_value=mock_dedup_instance
     ), patch(
-        "main.DescriptionFetcher"
+        "main.DescriptionFetcher", return_value=AsyncMock()
     ):
 
         orchestrator = JobScraperOrchestrator(languages=["en"])
@@ -121,7 +124,7 @@ async def test_scraper_skips_duplicates():
         await orchestrator.run()
 
         # Should have checked duplicate
-        assert mock_dedup_instance.is_duplicate.called
+        assert mock_dedup_instance.filter_new.called
 
-        # Should NOT have inserted because is_duplicate returned True
+        # Should NOT have inserted because filter_new dropped the job
         mock_db.insert_job.assert_not_called()
@@ -1,15 +1,23 @@
 import pytest
 import datetime
 from datetime import date
-from unittest.mock import Mock, MagicMock, patch
+from unittest.mock import Mock, MagicMock, AsyncMock, patch
 import sys
 import os
+import time
+import orjson
 
 # Add parent directory to path to allow imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from bs4 import BeautifulSoup
 from main import JobScraperOrchestrator
+from database.mongo_client import MongoDBClient, get_client
+from scrapers.linkedin_scraper import LinkedInScraper
 from utils.deduplicator import JobDeduplicator
+from utils.disk_cache import DiskCache
+from utils.geocoding import Geocoder, _MISS
+from utils.rate_limited_fetcher import RateLimitedFetcher
 
 
 class TestJobScraperOrchestrator:
@@ -33,6 +41,43 @@ class TestJobScraperOrchestrator:
         dt = orchestrator.parse_date("15 Jan 2024")
         assert dt.year == 2024 and dt.month == 1 and dt.day == 15
 
+    @pytest.mark.asyncio
+    async def test_prefetch_descriptions_respects_limit(self, orchestrator):
+        orchestrator.description_fetcher.fetch_many = AsyncMock(
+            side_effect=lambda urls: [("Description", None)] * len(urls)
+        )
+        now = datetime.datetime.now().isoformat()
+        jobs = [
+            {"link": f"http://job{i}.com", "title": "Python Developer", "published_at": now}
+            for i in range(5)
+        ]
+
+        descriptions = await orchestrator.prefetch_descriptions(jobs, limit=2)
+
+        assert list(descriptions) == ["http://job0.com", "http://job1.com"]
+
+    @pytest.mark.asyncio
+    async def test_retry_deferred_geocodes_updates_saved_jobs(self, orchestrator):
+        geo = {"lat": 45.46, "lng": 9.19, "formatted_address": "Milan, Italy"}
+        orchestrator.geocoder.deferred = {"Milan", "Nowhere"}
+        orchestrator.geocoder.get_coordinates_many = AsyncMock(
+            side_effect=lambda addresses: [
+                geo if address == "Milan" else None for address in addresses
+            ]
+        )
+        orchestrator.ungeocoded_jobs = {"Milan": ["id1", "id2"], "Nowhere": ["id3"]}
+
+        await orchestrator.retry_deferred_geocodes()
+
+        orchestrator.db_client.set_job_location.assert_called_once_with(
+            ["id1", "id2"], geo
+        )
+
+    def test_parse_date_iso_with_offset(self, orchestrator):
+        dt = orchestrator.parse_date("2023-10-27T15:24:02+00:00")
+        assert dt == datetime.datetime(2023, 10, 27, 15, 24, 2)
+        assert dt.tzinfo is None
+
     def test_parse_date_special_values(self, orchestrator):
         assert orchestrator.parse_date("older") is None
         assert orchestrator.parse_date(None) is None
@@ -46,6 +91,12 @@ class TestJobScraperOrchestrator:
         parsed = orchestrator.parse_date(today)
         assert parsed.year == today.year and parsed.month == today.month
 
+    def test_is_relevant_job(self, orchestrator):
+        assert orchestrator.is_relevant_job("Senior PYTHON Developer") is True
+        assert orchestrator.is_relevant_job("Sviluppatore C++") is True
+        assert orchestrator.is_relevant_job("Sales Manager") is False
+        assert orchestrator.is_relevant_job("") is False
+
     def test_is_published_today(self, orchestrator):
         # Mock today
         assert orchestrator.is_published_today("today") is True
@@ -63,6 +114,7 @@ class TestJobScraperOrchestrator:
 class TestJobDeduplicator:
     def test_is_duplicate_true(self):
         mock_db = Mock()
+        mock_db.jobs.find.return_value = [{"link": "http://example.com"}]
         # Simulate finding a document
         mock_db.jobs.find_one.return_value = {
             "_id": "123",
@@ -81,6 +133,55 @@ class TestJobDeduplicator:
         deduplicator = JobDeduplicator(mock_db)
         assert deduplicator.is_duplicate({"link": "http://new.com"}) is False
 
+    def test_is_duplicate_remembers_known_links(self):
+        mock_db = Mock()
+        mock_db.jobs.find.return_value = [{"link": "http://example.com"}]
+        mock_db.jobs.find_one.return_value = {"link": "http://example.com"}
+
+        deduplicator = JobDeduplicator(mock_db)
+        assert deduplicator.is_duplicate({"link": "http://example.com"}) is True
+        assert deduplicator.is_duplicate({"link": "http://example.com"}) is True
+        mock_db.jobs.find_one.assert_called_once()
+
+    def test_filter_new_uses_single_query(self):
+        mock_db = Mock()
+        mock_db.jobs.find.return_value = [{"link": "http://old.com"}]
+
+        deduplicator = JobDeduplicator(mock_db)
+        jobs = [{"link": "http://old.com"}, {"link": "http://new.com"}]
+        assert deduplicator.filter_new(jobs) == [{"link": "http://new.com"}]
+        # Only the preloaded link needs confirming
+        mock_db.jobs.find.assert_called_with(
+            {"link": {"$in": ["http://old.com"]}},
+            {"link": 1, "_id": 0},
+        )
+
+    def test_filter_new_drops_repeated_links(self):
+        mock_db = Mock()
+        mock_db.jobs.find.return_value = []
+
+        deduplicator = JobDeduplicator(mock_db)
+        jobs = [
+            {"link": "http://new.com", "title": "first"},
+            {"link": "http://new.com", "title": "second"},
+            {"title": "no link"},
+        ]
+        assert deduplicator.filter_new(jobs) == [
+            {"link": "http://new.com", "title": "first"},
+            {"title": "no link"},
+        ]
+
+    def test_is_duplicate_skips_db_for_unknown_links(self):
+        mock_db = Mock()
+        mock_db.jobs.find.return_value = [{"link": "http://old.com"}]
+
+        deduplicator = JobDeduplicator(mock_db)
+        assert deduplicator.is_duplicate({"link": "http://new.com"}) is False
+        mock_db.jobs.find_one.assert_not_called()
+
+        deduplicator.add("http://new.com")
+        assert deduplicator.is_duplicate({"link": "http://new.com"}) is True
+
     def test_is_duplicate_no_link(self):
         mock_db = Mock()
         deduplicator = JobDeduplicator(mock_db)
@@ -92,8 +193,6 @@ class TestLinkedInScraper:
 
     @pytest.fixture
     def scraper(self):
-        from scrapers.linkedin_scraper import LinkedInScraper
-
         return LinkedInScraper()
 
     def test_init(self, scraper):
@@ -116,8 +215,6 @@ class TestLinkedInScraper:
 
     def test_parse_job_card_success(self, scraper):
         """Test parsing a valid job card HTML."""
-        from bs4 import BeautifulSoup
-
         html = """
         <div class="base-card" data-entity-urn="urn:li:jobPosting:123456789">
             <a class="base-card__full-link" href="https://www.linkedin.com/jobs/view/123456789/?trackingId=abc"></a>
@@ -131,7 +228,7 @@ class TestLinkedInScraper:
             </div>
         </div>
         """
-        soup = BeautifulSoup(html, "html.parser")
+        soup = BeautifulSoup(html, "lxml")
         card = soup.find("div", class_="base-card")
 
         result = scraper._parse_job_card(card, "it")
@@ -148,8 +245,6 @@ class TestLinkedInScraper:
 
     def test_parse_job_card_missing_info(self, scraper):
         """Test parsing a job card with missing critical info."""
-        from bs4 import BeautifulSoup
-
         # Missing title and link
         html = """
         <div class="base-card">
@@ -157,8 +252,289 @@ class TestLinkedInScraper:
             </div>
         </div>
         """
-        soup = BeautifulSoup(html, "html.parser")
+        soup = BeautifulSoup(html, "lxml")
         card = soup.find("div", class_="base-card")
 
         result = scraper._parse_job_card(card, "it")
         assert result is None
+
+    def test_clean_description_strips_media(self, scraper):
+        html = '<p>Hello <img src="x.png"> world</p><script>x()</script>tail'
+        assert scraper.clean_description(html) == "<p>Hello  world</p>tail"
+        assert scraper.clean_description("plain text") == "plain text"
+
+    def test_clean_description_keeps_leading_text_escaped(self, scraper):
+        html = "&lt;script&gt;alert(1)&lt;/script&gt; <p>ok</p>"
+        cleaned = scraper.clean_description(html)
+        assert "<script>" not in cleaned
+        assert cleaned == "&lt;script&gt;alert(1)&lt;/script&gt; <p>ok</p>"
+
+    def test_parse_job_details(self, scraper):
+        html = """
+        <html><body>
+            <div class="show-more-less-html__markup description__text">
+                <p>Build <strong>APIs</strong>.</p>
+                <button class="show-more-less-html__button">Show more</button>
+            </div>
+            <ul>
+                <li class="description__job-criteria-item">
+                    <h3>Seniority level</h3><span> Mid-Senior level </span>
+                </li>
+            </ul>
+        </body></html>
+        """
+        details = scraper._parse_job_details(html)
+
+        assert details["description"] == "Build **APIs**."
+        assert details["seniority"] == "Mid-Senior level"
+
+    @pytest.mark.asyncio
+    async def test_fetch_many_preserves_order_and_skips_missing_ids(self, scraper):
+        """Test concurrent detail fetching."""
+        scraper.fetch_job_details = AsyncMock(
+            side_effect=lambda job_id: {"description": f"desc {job_id}"}
+        )
+
+        results = await scraper.fetch_many(["1", None, "3"])
+
+        assert results == [{"description": "desc 1"}, None, {"description": "desc 3"}]
+        assert scraper.fetch_job_details.call_count == 2
+
+
+class TestRateLimitedFetcher:
+    """Unit tests for the retrying, per-host rate-limited HTTP helper."""
+
+    @staticmethod
+    def _response(status, headers=None):
+        response = Mock()
+        response.status = status
+        response.headers = headers or {}
+        return response
+
+    @pytest.mark.asyncio
+    async def test_retries_on_429_then_succeeds(self):
+        throttled = self._response(429, {"Retry-After": "0"})
+        ok = self._response(200)
+        session = Mock()
+        session.get = AsyncMock(side_effect=[throttled, ok])
+
+        fetcher = RateLimitedFetcher()
+        async with fetcher.get(session, "https://api.example.com/jobs") as response:
+            assert response is ok
+
+        assert session.get.call_count == 2
+        throttled.release.assert_called_once()
+        ok.release.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_returns_last_response_after_max_attempts(self):
+        session = Mock()
+        session.get = AsyncMock(
+            return_value=self._response(503, {"Retry-After": "0"})
+        )
+
+        fetcher = RateLimitedFetcher(max_attempts=2)
+        async with fetcher.get(session, "https://api.example.com/jobs") as response:
+            assert response.status == 503
+
+        assert session.get.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_exhausted_rate_limit_defers_host(self):
+        session = Mock()
+        session.get = AsyncMock(
+            return_value=self._response(
+                200, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": "30"}
+            )
+        )
+
+        fetcher = RateLimitedFetcher()
+        async with fetcher.get(session, "https://api.example.com/jobs"):
+            pass
+
+        assert "api.example.com" in fetcher.next_allowed_ts
+
+    @pytest.mark.asyncio
+    async def test_rps_spaces_requests_to_same_host(self):
+        fetcher = RateLimitedFetcher(rps=10)
+
+        await fetcher._wait_for_host("example.com")
+        first_slot = fetcher.next_allowed_ts["example.com"]
+        await fetcher._wait_for_host("example.com")
+
+        assert fetcher.next_allowed_ts["example.com"] == pytest.approx(
+            first_slot + 0.1
+        )
+        assert "other.com" not in fetcher.next_allowed_ts
+
+
+class TestGeocoder:
+    """Unit tests for the cached Google geocoder."""
+
+    OK_RESPONSE = {
+        "status": "OK",
+        "results": [
+            {
+                "geometry": {"location": {"lat": 45.46, "lng": 9.19}},
+                "formatted_address": "Milan, Italy",
+            }
+        ],
+    }
+
+    def test_get_coordinates_caches_normalized_address(self):
+        geocoder = Geocoder(api_key="key")
+        with patch.object(geocoder.session, "get") as mock_get:
+            mock_get.return_value.status_code = 200
+            mock_get.return_value.content = orjson.dumps(self.OK_RESPONSE)
+            first = geocoder.get_coordinates("Milan, Italy")
+            second = geocoder.get_coordinates("  milan,   ITALY ")
+
+        assert first == second == {
+            "lat": 45.46,
+            "lng": 9.19,
+            "formatted_address": "Milan, Italy",
+        }
+        mock_get.assert_called_once()
+
+    def test_get_coordinates_retries_over_query_limit(self):
+        geocoder = Geocoder(api_key="key")
+        over_limit = Mock(
+            status_code=200,
+            headers={},
+            content=orjson.dumps({"status": "OVER_QUERY_LIMIT"}),
+        )
+        ok = Mock(status_code=200, headers={}, content=orjson.dumps(self.OK_RESPONSE))
+
+        with patch.object(geocoder.session, "get", side_effect=[over_limit, ok]), patch(
+            "utils.geocoding.time.sleep"
+        ) as mock_sleep:
+            result = geocoder.get_coordinates("Milan, Italy")
+
+        assert result["lat"] == 45.46
+        mock_sleep.assert_called_once()
+
+    def test_get_coordinates_defers_after_persistent_429(self):
+        geocoder = Geocoder(api_key="key")
+        throttled = Mock(status_code=429, headers={"Retry-After": "2"})
+
+        with patch.object(geocoder.session, "get", return_value=throttled), patch(
+            "utils.geocoding.time.sleep"
+        ) as mock_sleep:
+            assert geocoder.get_coordinates("Milan, Italy") is None
+
+        assert geocoder.deferred == {"Milan, Italy"}
+        mock_sleep.assert_called_with(2.0)
+
+    def test_get_coordinates_persists_results_across_instances(self, tmp_path):
+        cache_path = str(tmp_path / "geocode.sqlite")
+        geocoder = Geocoder(api_key="key", cache_path=cache_path)
+        responses = [
+            Mock(status_code=200, content=orjson.dumps(self.OK_RESPONSE)),
+            Mock(
+                status_code=200,
+                content=orjson.dumps({"status": "ZERO_RESULTS", "results": []}),
+            ),
+        ]
+        with patch.object(geocoder.session, "get", side_effect=responses):
+            geocoder.get_coordinates("Milan, Italy")
+            geocoder.get_coordinates("Nowhere")
+
+        restarted = Geocoder(api_key="key", cache_path=cache_path)
+        with patch.object(restarted.session, "get") as mock_get:
+            assert restarted.get_coordinates("milan, italy")["lat"] == 45.46
+            assert restarted.get_coordinates("Nowhere") is None
+        mock_get.assert_not_called()
+        geocoder.close()
+        restarted.close()
+
+    def test_get_coordinates_disk_entries_expire(self, tmp_path):
+        cache_path = str(tmp_path / "geocode.sqlite")
+        geocoder = Geocoder(api_key="key", cache_path=cache_path)
+        responses = [
+            Mock(status_code=200, content=orjson.dumps(self.OK_RESPONSE)),
+            Mock(
+                status_code=200,
+                content=orjson.dumps({"status": "ZERO_RESULTS", "results": []}),
+            ),
+        ]
+        with patch.object(geocoder.session, "get", side_effect=responses):
+            geocoder.get_coordinates("Milan, Italy")
+            geocoder.get_coordinates("Nowhere")
+        geocoder.close()
+
+        now = time.time()
+        with patch("utils.disk_cache.time.time", return_value=now + 8 * 86400):
+            later = Geocoder(api_key="key", cache_path=cache_path)
+            assert later._lookup("milan, italy") is not _MISS
+            assert later._lookup("nowhere") is _MISS
+            later.close()
+        with patch("utils.disk_cache.time.time", return_value=now + 31 * 86400):
+            later = Geocoder(api_key="key", cache_path=cache_path)
+            assert later._lookup("milan, italy") is _MISS
+            later.close()
+
+    @pytest.mark.asyncio
+    async def test_get_coordinates_many_looks_up_each_address_once(self):
+        geocoder = Geocoder(api_key="key")
+        response = Mock(status=200, headers={})
+        response.read = AsyncMock(return_value=orjson.dumps(self.OK_RESPONSE))
+        session = MagicMock()
+        session.get = AsyncMock(return_value=response)
+        session.__aenter__ = AsyncMock(return_value=session)
+        session.__aexit__ = AsyncMock(return_value=None)
+
+        with patch("utils.geocoding.aiohttp.ClientSession", return_value=session):
+            results = await geocoder.get_coordinates_many(
+                ["Milan, Italy", None, "milan, italy"]
+            )
+
+        assert results[0] == results[2] and results[0]["lat"] == 45.46
+        assert results[1] is None
+        session.get.assert_called_once()
+
+
+class TestDiskCache:
+    def test_purges_expired_rows_on_open(self, tmp_path):
+        path = str(tmp_path / "cache.sqlite")
+        cache = DiskCache(path)
+        cache.set("old", 1, ttl=-1)
+        cache.set("fresh", 2, ttl=60)
+        cache.close()
+
+        keys = [row[0] for row in cache.conn.execute("SELECT key FROM cache")]
+        assert keys == ["fresh"]
+        assert cache.get("fresh") == 2
+        cache.close()
+
+    def test_unusable_path_degrades_to_misses(self, tmp_path):
+        blocker = tmp_path / "file"
+        blocker.write_text("")
+        # The cache directory can't be created below a regular file
+        cache = DiskCache(str(blocker / "cache.sqlite"))
+
+        with patch("utils.disk_cache.logger") as logger:
+            cache.set("key", 1)
+            cache.set_many({"other": 2})
+            assert cache.get("key") is None
+
+        assert cache.disabled
+        # Only the first failure is reported
+        logger.warning.assert_called_once()
+
+
+class TestMongoDBClient:
+    def test_get_client_rejects_missing_uri(self):
+        with pytest.raises(ValueError):
+            get_client(None)
+
+    def test_shares_the_pooled_client(self):
+        uri = "mongodb://localhost:27017/test"
+        with patch("database.mongo_client.MongoClient") as mongo_client:
+            db_client = MongoDBClient(uri, "test")
+            assert get_client(uri) is db_client.client
+            mongo_client.assert_called_once()
+
+            # A closed client is not handed out again
+            db_client.close()
+            get_client(uri)
+            assert mongo_client.call_count == 2
@@ -1,5 +1,5 @@
 import logging
-from typing import Dict
+from typing import Dict, List, Optional, Set
 from database.mongo_client import MongoDBClient
 
 logger = logging.getLogger(__name__)
@@ -7,12 +7,75 @@ logger = logging.getLogger(__name__)
 class JobDeduplicator:
     def __init__(self, db_client: MongoDBClient):
         self.db = db_client
+        # Links already known to be in the DB, answered without a round trip
+        self._seen_links = set()
+        # Snapshot of every stored link: a link missing from it is new, so
+        # only links present in it need to be confirmed against Mongo
+        self._known_links = self._load_links()
+
+    def _load_links(self) -> Optional[Set[str]]:
+        """Load all stored links, or None if the snapshot can't be built"""
+        try:
+            return {
+                doc["link"]
+                for doc in self.db.jobs.find({}, {"link": 1, "_id": 0})
+                if doc.get("link")
+            }
+        except Exception as e:
+            logger.warning(f"Could not preload job links, checking each in DB: {e}")
+            return None
+
+    def _maybe_known(self, link: str) -> bool:
+        return self._known_links is None or link in self._known_links
 
     def is_duplicate(self, job: Dict) -> bool:
         """Check if job already exists in DB by link"""
         link = job.get('link')
         if not link:
             return False
-            
+
+        if link in self._seen_links:
+            return True
+        if not self._maybe_known(link):
+            return False
+
         existing = self.db.jobs.find_one({"link": link})
-        return existing is not None
+        if existing is not None:
+            self._seen_links.add(link)
+            return True
+        return False
+
+    def filter_new(self, jobs: List[Dict]) -> List[Dict]:
+        """
+        Return the jobs whose link is not in the DB, using a single query.
+        Only the first job for each link is kept.
+        """
+        links = [
+            job["link"]
+            for job in jobs
+            if job.get("link")
+            and job["link"] not in self._seen_links
+            and self._maybe_known(job["link"])
+        ]
+        if links:
+            existing = self.db.jobs.find(
+                {"link": {"$in": links}}, {"link": 1, "_id": 0}
+            )
+            self._seen_links.update(doc["link"] for doc in existing)
+
+        new_jobs = []
+        yielded = set()
+        for job in jobs:
+            link = job.get("link")
+            if link in self._seen_links or link in yielded:
+                continue
+            if link:
+                yielded.add(link)
+            new_jobs.append(job)
+        return new_jobs
+
+    def add(self, link: str):
+        """Record a link that has just been inserted"""
+        self._seen_links.add(link)
+        if self._known_links is not None:
+            self._known_links.add(link)
@@ -1,25 +1,192 @@
 import aiohttp
 import asyncio
-from bs4 import BeautifulSoup, Comment
+import hashlib
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from lxml import etree, html as lxml_html
 import logging
+import multiprocessing
+import os
 import re
+from typing import Optional
 from markdownify import markdownify as md
+from utils.disk_cache import DiskCache
+from utils.html_to_markdown import html_to_markdown
+from utils.rate_limited_fetcher import RateLimitedFetcher
 
 logger = logging.getLogger(__name__)
 
+# Stripped from the page in a single traversal before looking for content
+_UNWANTED_TAGS = frozenset(
+    {
+        "script",
+        "style",
+        "nav",
+        "header",
+        "footer",
+        "iframe",
+        "noscript",
+        "meta",
+        "link",
+    }
+)
+
+_BLANK_LINES_RE = re.compile(r"\n\s*\n")
+
+# Number of extracted pages remembered by content hash
+CONTENT_CACHE_SIZE = 512
+
+# Set DESCRIPTION_USE_MARKDOWNIFY=1 to convert with markdownify instead of the
+# built-in converter (slower: it re-parses the serialized HTML)
+USE_MARKDOWNIFY = os.getenv("DESCRIPTION_USE_MARKDOWNIFY", "").lower() in (
+    "1",
+    "true",
+    "yes",
+)
+
+# Markdown of recently converted containers, keyed by a digest of their
+# markup. Module-level so each parser worker process keeps its own.
+MARKDOWN_CACHE_SIZE = 256
+_markdown_cache: OrderedDict[bytes, str] = OrderedDict()
+
+# Successful extractions are kept on disk this long, keyed by URL
+URL_CACHE_TTL = 7 * 86400
+
+# Pages are read up to this size; the description is well within the first MB
+MAX_PAGE_BYTES = 1 << 20
+
+# Job description containers common in job boards, matched in a single pass
+_CANDIDATES_XPATH = etree.XPath(
+    "//*[contains(@class, 'description')"
+    " or contains(@id, 'description')"
+    " or contains(@class, 'job-body')"
+    " or contains(@class, 'job-content')"
+    " or self::article"
+    " or self::main"
+    " or @role='main']"
+)
+
+# Comments and processing instructions are dropped while parsing, so those
+# nodes are never built and no sweep over the tree is needed afterwards.
+# One parser per process; extraction runs in worker processes.
+_HTML_PARSER = lxml_html.HTMLParser(remove_comments=True, remove_pis=True)
+
+# Candidates below this are ignored; the first one above MIN_STRONG_TEXT wins
+MIN_CANDIDATE_TEXT = 300
+MIN_STRONG_TEXT = 1000
+
+
+def _text_length(element, cache: dict) -> int:
+    """
+    Length of the element's text with each string stripped (BS4 get_text(strip=True)).
+    Lengths are computed bottom-up and memoized for the whole subtree, so a
+    candidate nested in one already scored is looked up instead of re-walked.
+    """
+    length = cache.get(element)
+    if length is not None:
+        return length
+
+    # Reversed document order visits children before their parents
+    for el in reversed(list(element.iter())):
+        if el in cache:
+            continue
+        length = 0
+        if isinstance(el.tag, str):
+            if el.text:
+                length += len(el.text.strip())
+            for child in el:
+                length += cache[child]
+                if child.tail:
+                    length += len(child.tail.strip())
+        cache[el] = length
+    return cache[element]
+
+
+def _pool_context():
+    """Start method for the worker pool: forkserver where available"""
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
+
 
 class DescriptionFetcher:
     """
     Utility to fetch and extract the main job description content from a URL.
     """
 
-    def __init__(self, timeout=10):
+    def __init__(
+        self,
+        timeout=10,
+        max_concurrency=16,
+        rps=8,
+        max_bytes=MAX_PAGE_BYTES,
+        cache_path: Optional[str] = None,
+    ):
         self.timeout = timeout
+        self.max_bytes = max_bytes
+        # Optional on-disk cache of (description, logo_url) by URL, so pages
+        # seen in earlier runs aren't downloaded and parsed again
+        self._url_cache = (
+            DiskCache(cache_path, ttl=URL_CACHE_TTL) if cache_path else None
+        )
         self.headers = {
             "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
             "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8",
             "Accept-Language": "en-US,en;q=0.9,it;q=0.8",
         }
+        # Created lazily: a ClientSession must be opened inside the event loop
+        self._session: Optional[aiohttp.ClientSession] = None
+        # Caps requests in flight across all job boards, while each board is
+        # paced to `rps` requests per second so it doesn't answer with 429s
+        self._sem = asyncio.Semaphore(max_concurrency)
+        # Transient failures (429 / 5xx / connection errors) are retried with
+        # exponential backoff, honouring Retry-After
+        self._fetcher = RateLimitedFetcher(
+            max_attempts=3,
+            per_host_concurrency=max_concurrency,
+            max_backoff=30.0,
+            rps=rps,
+        )
+        # HTML parsing is CPU-bound; run it in worker processes so it neither
+        # blocks the event loop nor serializes on the GIL
+        self._pool: Optional[ProcessPoolExecutor] = None
+        # LRU of extraction results keyed by a digest of the page HTML. It lives
+        # in this process because each worker would only see its own share
+        self._content_cache: OrderedDict[bytes, tuple] = OrderedDict()
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Return the pooled session shared by all fetch() calls."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=64,
+                    limit_per_host=16,
+                    ttl_dns_cache=300,
+                    keepalive_timeout=75,
+                    ssl=False,
+                ),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers=self.headers,
+            )
+        return self._session
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def close(self):
+        """Close the pooled session, the parser worker processes and the cache."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+        if self._url_cache is not None:
+            self._url_cache.close()
 
     async def fetch(self, url: str) -> tuple[str, str | None]:
         """
@@ -29,96 +196,107 @@ class DescriptionFetcher:
         if not url:
             return None, None
 
-        async with aiohttp.ClientSession() as session:
-            try:
-                async with session.get(
-                    url, headers=self.headers, timeout=self.timeout, ssl=False
-                ) as response:
-                    if response.status != 200:
-                        raise Exception(f"HTTP {response.status}")
-
-                    html = await response.text()
-                    return self._extract_content(html)
-            except Exception as e:
-                logger.error(f"Error fetching {url}: {str(e)}")
-                return None, None
-
-    def _extract_content(self, html: str) -> tuple[str, str | None]:
+        try:
+            cache_key = hashlib.sha1(url.encode()).hexdigest()
+            if self._url_cache is not None:
+                cached = self._url_cache.get(cache_key)
+                if cached is not None:
+                    return tuple(cached)
+
+            session = await self._get_session()
+            async with self._sem, self._fetcher.get(session, url) as response:
+                if response.status != 200:
+                    raise Exception(f"HTTP {response.status}")
+
+                # Read in chunks up to max_bytes, and decode with the declared
+                # charset rather than letting aiohttp sniff the encoding
+                body = bytearray()
+                async for chunk in response.content.iter_chunked(1 << 16):
+                    body += chunk
+                    if len(body) >= self.max_bytes:
+                        break
+                body = body[: self.max_bytes]
+                try:
+                    html = body.decode(response.charset or "utf-8", errors="replace")
+                except LookupError:
+                    # Unknown charset name in Content-Type
+                    html = body.decode("utf-8", errors="replace")
+
+            result = await self._extract_cached(html)
+            if self._url_cache is not None and result[0]:
+                self._url_cache.set(cache_key, result)
+            return result
+        except Exception as e:
+            logger.error(f"Error fetching {url}: {str(e)}")
+            return None, None
+
+    async def _extract_cached(self, html: str) -> tuple:
         """
-        Heuristic to find the main content of the job text.
-        Returns (description_markdown, logo_url)
+        Run _extract_content in the worker pool, skipping pages whose HTML was
+        already extracted.
         """
-        soup = BeautifulSoup(html, "html.parser")
+        key = hashlib.blake2b(html.encode(), digest_size=16).digest()
+        cached = self._content_cache.get(key)
+        if cached is not None:
+            self._content_cache.move_to_end(key)
+            return cached
 
-        # Remove unwanted elements
-        for element in soup(
-            [
-                "script",
-                "style",
-                "nav",
-                "header",
-                "footer",
-                "iframe",
-                "noscript",
-                "meta",
-                "link",
-            ]
-        ):
-            element.decompose()
-
-        # Remove comments
-        for comment in soup.find_all(string=lambda text: isinstance(text, Comment)):
-            comment.extract()
-
-        # Heuristics for container
-        candidates = []
-
-        # 1. Look for specific job description selectors common in job boards
-        selectors = [
-            '[class*="description"]',
-            '[id*="description"]',
-            '[class*="job-body"]',
-            '[class*="job-content"]',
-            "article",
-            "main",
-            '[role="main"]',
-        ]
+        if self._pool is None:
+            # Not forked: this process already runs pymongo and aiohttp threads
+            self._pool = ProcessPoolExecutor(
+                max_workers=os.cpu_count(), mp_context=_pool_context()
+            )
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(
+                self._pool, self._extract_content, html
+            )
+        except BrokenProcessPool:
+            # A worker died; the pool is unusable, so start a new one next time
+            logger.error("Description worker pool broke, restarting it")
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+            raise
 
-        target_container = None
-        for selector in selectors:
-            elements = soup.select(selector)
-            for el in elements:
-                text_len = len(el.get_text(strip=True))
-                # Filter out small snippets
-                if text_len > 300:
-                    candidates.append((el, text_len))
-
-        if candidates:
-            candidates.sort(key=lambda x: x[1], reverse=True)
-            target_container = candidates[0][0]
+        self._content_cache[key] = result
+        if len(self._content_cache) > CONTENT_CACHE_SIZE:
+            self._content_cache.popitem(last=False)
+        return result
 
-        # 3. Fallback: Body text
-        if not target_container:
-            body = soup.find("body")
-            if body and len(body.get_text(strip=True)) > 300:
-                target_container = body
+    async def fetch_many(self, urls: list[str]) -> list:
+        """
+        Fetch many URLs concurrently, at most `max_concurrency` at a time (the
+        limit every fetch() call shares). Returns results in input order;
+        failures are returned as exceptions.
+        """
+        return await asyncio.gather(
+            *(self.fetch(url) for url in urls), return_exceptions=True
+        )
+
+    @staticmethod
+    def _extract_content(html: str) -> tuple[str, str | None]:
+        """
+        Heuristic to find the main content of the job text.
+        Returns (description_markdown, logo_url)
+        """
+        if not html or not html.strip():
+            return None, None
 
-        if not target_container:
+        tree = lxml_html.document_fromstring(html, parser=_HTML_PARSER)
+        target_container = DescriptionFetcher._find_container(tree)
+
+        if target_container is None:
             return None, None
 
         # Extract logo if it's an image at the very beginning
         logo_url = None
         # Look for the first img tag
-        first_img = target_container.find("img")
-        if first_img:
+        first_img = target_container.find(".//img")
+        if first_img is not None:
             # Check if there is significant text before this image
             # We look at the absolute position in the text representation
-            text_upto_img = ""
-            for sibling in first_img.previous_siblings:
-                if hasattr(sibling, "get_text"):
-                    text_upto_img += sibling.get_text()
-                else:
-                    text_upto_img += str(sibling)
+            text_upto_img = first_img.getparent().text or ""
+            for sibling in first_img.itersiblings(preceding=True):
+                text_upto_img += sibling.text_content() + (sibling.tail or "")
 
             # Heuristic: if less than 50 chars of text before the first image,
             # we consider it a header/logo and extract it.
@@ -126,20 +304,70 @@ class DescriptionFetcher:
                 logo_url = first_img.get("src")
                 if logo_url:
                     logger.info(f"Extracted logo from description header: {logo_url}")
-                    first_img.decompose()  # Remove from description content
+                    first_img.drop_tree()  # Remove from description content
 
         # REMOVE ALL OTHER IMAGES (per user request)
-        for img in target_container.find_all("img"):
-            img.decompose()
+        for img in list(target_container.iter("img")):
+            img.drop_tree()
+
+        # The same description is often embedded in otherwise different pages
+        # (tracking params, related jobs), so reuse its Markdown when the
+        # container markup is unchanged
+        markup = lxml_html.tostring(target_container, encoding="unicode")
+        key = hashlib.blake2b(markup.encode(), digest_size=16).digest()
+        description = _markdown_cache.get(key)
+        if description is not None:
+            _markdown_cache.move_to_end(key)
+            return description, logo_url
 
-        # Convert to markdown
-        description = self._clean_markdown(md(str(target_container)))
+        # Convert to markdown straight from the parsed tree
+        if USE_MARKDOWNIFY:
+            markdown = md(markup)
+        else:
+            markdown = html_to_markdown(target_container)
+        description = DescriptionFetcher._clean_markdown(markdown)
+
+        _markdown_cache[key] = description
+        if len(_markdown_cache) > MARKDOWN_CACHE_SIZE:
+            _markdown_cache.popitem(last=False)
         return description, logo_url
 
-    def _clean_markdown(self, text: str) -> str:
+    @staticmethod
+    def _find_container(tree):
+        """
+        Pick the element most likely to hold the job description, or None.
+        """
+        # Remove unwanted elements
+        etree.strip_elements(tree, *_UNWANTED_TAGS, with_tail=False)
+
+        # Heuristics for container: keep the longest candidate, but stop at the
+        # first one long enough to be the description on its own
+        target_container = None
+        best_len = MIN_CANDIDATE_TEXT
+        text_lengths = {}
+        for el in _CANDIDATES_XPATH(tree):
+            text_len = _text_length(el, text_lengths)
+            if text_len > best_len:
+                target_container, best_len = el, text_len
+                if text_len > MIN_STRONG_TEXT:
+                    break
+
+        # 3. Fallback: Body text
+        if target_container is None:
+            body = tree.find("body")
+            if (
+                body is not None
+                and _text_length(body, text_lengths) > MIN_CANDIDATE_TEXT
+            ):
+                target_container = body
+
+        return target_container
+
+    @staticmethod
+    def _clean_markdown(text: str) -> str:
         """
         Clean whitespace and normalize markdown text.
         """
         # Collapse multiple newlines
-        text = re.sub(r"\n\s*\n", "\n\n", text)
+        text = _BLANK_LINES_RE.sub("\n\n", text)
         return text.strip()
@@ -0,0 +1,111 @@
+import logging
+import os
+import sqlite3
+import time
+from typing import Any, Dict, Optional
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+
+class DiskCache:
+    """
+    Small persistent key/value store backed by SQLite, so cached results
+    survive restarts. Values are stored as JSON; entries can expire.
+    """
+
+    def __init__(self, path: str, ttl: Optional[float] = None):
+        self.path = path
+        self.ttl = ttl
+        # Opened lazily, and reopened if used again after close()
+        self._conn: Optional[sqlite3.Connection] = None
+        # Set when the database can't be opened: every call is then a no-op
+        self.disabled = False
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path)
+            try:
+                # WAL lets other processes read while a run writes
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS cache "
+                    "(key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL)"
+                )
+                # Expired rows are never read again: drop them once per open
+                with conn:
+                    conn.execute(
+                        "DELETE FROM cache WHERE expires < ?", (time.time(),)
+                    )
+            except sqlite3.Error:
+                conn.close()
+                raise
+            self._conn = conn
+        return self._conn
+
+    def _failed(self, action: str, error: Exception):
+        if self._conn is None:
+            # The database couldn't even be opened: stop trying
+            self.disabled = True
+            logger.warning(f"Disk cache {self.path} disabled: {error}")
+        else:
+            logger.warning(f"Disk cache {action} failed: {error}")
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the value stored for ``key``, or None if missing or expired"""
+        if self.disabled:
+            return None
+        try:
+            row = self.conn.execute(
+                "SELECT value, expires FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+        except (sqlite3.Error, OSError) as e:
+            self._failed("read", e)
+            return None
+
+        if row is None:
+            return None
+        value, expires = row
+        if expires is not None and expires < time.time():
+            return None
+        return orjson.loads(value)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        """Store ``value`` for ``key``, expiring after ``ttl`` (default self.ttl)"""
+        if self.disabled:
+            return
+        ttl = ttl if ttl is not None else self.ttl
+        expires = time.time() + ttl if ttl is not None else None
+        try:
+            with self.conn:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO cache (key, value, expires) VALUES (?, ?, ?)",
+                    (key, orjson.dumps(value), expires),
+                )
+        except (sqlite3.Error, OSError) as e:
+            self._failed("write", e)
+
+    def set_many(self, items: Dict[str, Any], ttl: Optional[float] = None):
+        """Store several values in a single transaction"""
+        if self.disabled:
+            return
+        ttl = ttl if ttl is not None else self.ttl
+        expires = time.time() + ttl if ttl is not None else None
+        try:
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO cache (key, value, expires) VALUES (?, ?, ?)",
+                    [(key, orjson.dumps(value), expires) for key, value in items.items()],
+                )
+        except (sqlite3.Error, OSError) as e:
+            self._failed("write", e)
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
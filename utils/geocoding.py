@@ -1,39 +1,228 @@
+import aiohttp
+import asyncio
+import random
 import requests
 import logging
-from typing import Dict, Optional
+import orjson
+import time
+from typing import Dict, List, Optional, Set
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from utils.disk_cache import DiskCache
+from utils.rate_limited_fetcher import RateLimitedFetcher
 
 logger = logging.getLogger(__name__)
 
+GEOCODE_URL = "https://maps.googleapis.com/maps/api/geocode/json"
+# Statuses that are a definitive answer for an address, and so can be cached
+_FINAL_STATUSES = frozenset({"OK", "ZERO_RESULTS"})
+# Returned by Geocoder._lookup when an address has never been resolved
+_MISS = object()
+
+# Google's terms allow caching geocoding results for at most 30 days. "No
+# match" answers are kept for less, as new addresses get added over time.
+CACHE_TTL = 30 * 86400
+NEGATIVE_CACHE_TTL = 7 * 86400
+
+# Retries when the quota is exceeded (HTTP 429 or OVER_QUERY_LIMIT)
+MAX_ATTEMPTS = 3
+BACKOFF_BASE = 1.0
+BACKOFF_CAP = 30.0
+
+
+def _normalize(address: str) -> str:
+    return " ".join(address.lower().split())
+
+
+def _is_over_limit(status_code: int, data: Optional[Dict]) -> bool:
+    return status_code == 429 or (data or {}).get("status") == "OVER_QUERY_LIMIT"
+
+
+def _backoff(attempt: int, retry_after: Optional[str] = None) -> float:
+    """Seconds to wait before retrying: Retry-After if given, else exponential"""
+    try:
+        return min(float(retry_after), BACKOFF_CAP)
+    except (TypeError, ValueError):
+        return min(BACKOFF_CAP, BACKOFF_BASE * 2**attempt) + random.random() * 0.25
+
+
 class Geocoder:
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, cache_path: Optional[str] = None):
         self.api_key = api_key
+        # Normalized address -> coordinates (or None when Google has no match).
+        # Scrapes geocode the same few cities over and over.
+        self._cache: Dict[str, Optional[Dict[str, float]]] = {}
+        # Optional persistent copy of the cache, so restarts don't hit Google
+        # again. "No match" is stored as an empty dict.
+        self._disk = DiskCache(cache_path, ttl=CACHE_TTL) if cache_path else None
+        # Addresses still over quota after all retries. The orchestrator
+        # retries them with get_coordinates_many at the end of a run.
+        self.deferred: Set[str] = set()
+        # Keep-alive session so lookups reuse the TLS connection to Google.
+        # 429 is left out of the adapter's retries: it is handled below
+        # together with OVER_QUERY_LIMIT.
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=50,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=[500, 502, 503, 504],
+                raise_on_status=False,
+            ),
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
 
     def get_coordinates(self, address: str) -> Optional[Dict[str, float]]:
         """Fetch GPS coordinates from Google Maps Geocoding API"""
         if not self.api_key or not address:
             return None
-            
-        url = "https://maps.googleapis.com/maps/api/geocode/json"
+
+        key = _normalize(address)
+        cached = self._lookup(key)
+        if cached is not _MISS:
+            return cached
+
         params = {
             "address": address,
             "key": self.api_key
         }
-        
+
         try:
-            response = requests.get(url, params=params)
-            data = response.json()
-            
-            if data['status'] == 'OK':
-                result = data['results'][0]
-                location = result['geometry']['location']
-                return {
-                    "lat": location['lat'],
-                    "lng": location['lng'],
-                    "formatted_address": result.get('formatted_address')
-                }
-            else:
-                logger.warning(f"Geocoding failed for {address}: {data['status']}")
-                return None
+            for attempt in range(MAX_ATTEMPTS):
+                response = self.session.get(
+                    GEOCODE_URL, params=params, timeout=(3, 10)
+                )
+                data = (
+                    orjson.loads(response.content)
+                    if response.status_code != 429
+                    else None
+                )
+                if not _is_over_limit(response.status_code, data):
+                    coordinates = self._handle_response(key, address, data)
+                    self._persist([key])
+                    return coordinates
+                if attempt < MAX_ATTEMPTS - 1:
+                    time.sleep(_backoff(attempt, response.headers.get("Retry-After")))
+
+            self._defer(address)
+            return None
         except Exception as e:
             logger.error(f"Error calling Geocoding API: {e}")
             return None
+
+    async def get_coordinates_many(
+        self, addresses: List[str], concurrency: int = 16, rps: float = 45
+    ) -> List[Optional[Dict[str, float]]]:
+        """
+        Geocode many addresses concurrently over one session, paced to `rps`
+        requests per second (Google allows 50 QPS). Results are returned in
+        input order; each distinct address is looked up once.
+        """
+        if not self.api_key:
+            return [None] * len(addresses)
+
+        fetcher = RateLimitedFetcher(
+            max_attempts=1, per_host_concurrency=concurrency, rps=rps
+        )
+        pending: Dict[str, str] = {}
+        for address in addresses:
+            if address:
+                key = _normalize(address)
+                if key not in pending and self._lookup(key) is _MISS:
+                    pending[key] = address
+
+        async def _one(session: aiohttp.ClientSession, key: str, address: str):
+            params = {"address": address, "key": self.api_key}
+            try:
+                for attempt in range(MAX_ATTEMPTS):
+                    async with fetcher.get(
+                        session, GEOCODE_URL, params=params
+                    ) as response:
+                        status = response.status
+                        retry_after = response.headers.get("Retry-After")
+                        data = (
+                            orjson.loads(await response.read())
+                            if status != 429
+                            else None
+                        )
+                    if not _is_over_limit(status, data):
+                        self._handle_response(key, address, data)
+                        return
+                    if attempt < MAX_ATTEMPTS - 1:
+                        await asyncio.sleep(_backoff(attempt, retry_after))
+
+                self._defer(address)
+            except Exception as e:
+                logger.error(f"Error calling Geocoding API: {e}")
+
+        if pending:
+            async with aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=10)
+            ) as session:
+                await asyncio.gather(
+                    *(_one(session, key, address) for key, address in pending.items())
+                )
+            self._persist(pending)
+
+        return [
+            self._cache.get(_normalize(address)) if address else None
+            for address in addresses
+        ]
+
+    def _lookup(self, key: str):
+        """Cached coordinates for a normalized address, or _MISS"""
+        if key in self._cache:
+            return self._cache[key]
+        if self._disk is not None:
+            stored = self._disk.get(key)
+            if stored is not None:
+                self._cache[key] = stored or None
+                return self._cache[key]
+        return _MISS
+
+    def _persist(self, keys):
+        """Write the definitive answers among ``keys`` to the disk cache"""
+        if self._disk is None:
+            return
+        found = {key: self._cache[key] for key in keys if self._cache.get(key)}
+        missing = {
+            key: {} for key in keys if key in self._cache and not self._cache[key]
+        }
+        if found:
+            self._disk.set_many(found)
+        if missing:
+            self._disk.set_many(missing, ttl=NEGATIVE_CACHE_TTL)
+
+    def close(self):
+        """Close the HTTP session and the disk cache"""
+        self.session.close()
+        if self._disk is not None:
+            self._disk.close()
+
+    def _defer(self, address: str):
+        logger.warning(f"Geocoding quota exceeded for {address}, deferring it")
+        self.deferred.add(address)
+
+    def _handle_response(
+        self, key: str, address: str, data: Dict
+    ) -> Optional[Dict[str, float]]:
+        """Turn an API response into coordinates, caching definitive answers"""
+        coordinates = None
+        if data['status'] == 'OK':
+            result = data['results'][0]
+            location = result['geometry']['location']
+            coordinates = {
+                "lat": location['lat'],
+                "lng": location['lng'],
+                "formatted_address": result.get('formatted_address')
+            }
+        else:
+            logger.warning(f"Geocoding failed for {address}: {data['status']}")
+
+        if data['status'] in _FINAL_STATUSES:
+            self._cache[key] = coordinates
+            self.deferred.discard(address)
+        return coordinates
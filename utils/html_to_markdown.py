@@ -0,0 +1,313 @@
+import re
+from typing import List, Optional, Tuple, Union
+
+from lxml import etree
+
+# Converts an already-parsed lxml subtree to Markdown in one iterative walk,
+# so the HTML isn't serialized and re-parsed just to be converted.
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_BLANK_LINES_RE = re.compile(r"\n\s*\n")
+# Same characters markdownify escapes by default
+_ESCAPE_RE = re.compile(r"([*_])")
+
+# h1 maps to ## as well: the job title is shown separately, above the
+# description
+_HEADING_LEVELS = {"h1": 2, "h2": 2, "h3": 3, "h4": 4, "h5": 5, "h6": 6}
+_BLOCK_TAGS = frozenset(
+    {
+        "p",
+        "div",
+        "section",
+        "article",
+        "main",
+        "aside",
+        "header",
+        "footer",
+        "form",
+        "dl",
+        "dt",
+        "dd",
+        "figure",
+    }
+)
+_EMPHASIS = {"strong": "**", "b": "**", "em": "*", "i": "*"}
+_CELL_TAGS = frozenset({"td", "th"})
+# Dropped with their content
+_SKIPPED_TAGS = frozenset({"img", "script", "style", "noscript", "head"})
+
+
+# Work items of the explicit traversal stack
+_StackItem = Tuple[str, Union[etree._Element, str]]
+
+
+def _quote(body: str, indent: str = "") -> str:
+    """
+    Prefix every line of ``body`` with a blockquote marker. ``indent`` is the
+    list item indentation: moved in front of the markers, not kept after them.
+    """
+    body = _BLANK_LINES_RE.sub("\n\n", body.strip("\n"))
+    lines = [
+        line[len(indent):] if line.startswith(indent) else line.lstrip(" ")
+        for line in body.split("\n")
+    ]
+    return f"\n{indent}".join(f"> {line}" if line.strip() else ">" for line in lines)
+
+
+def html_to_markdown(root: etree._Element) -> str:
+    """
+    Render ``root`` (an lxml element) as Markdown. Covers the tags job
+    descriptions are made of: headings, paragraphs, lists, links, emphasis,
+    code, quotes, tables and line breaks. Unknown tags contribute their text
+    only.
+    """
+    out: List[str] = []
+    # One entry per open ul/ol: whether it is ordered, its first number, how
+    # many items it has seen so far, and the column its current item's
+    # content starts at
+    list_ordered: List[bool] = []
+    list_starts: List[int] = []
+    list_counts: List[int] = []
+    list_columns: List[int] = []
+    # len(out) right after the latest list marker, to tell empty items apart
+    item_start: int = -1
+    # Positions in ``out`` of the open emphasis markers, innermost last
+    emphasis_starts: List[int] = []
+    # Positions in ``out`` where each open blockquote starts
+    quote_starts: List[int] = []
+    # One entry per open table: how many rows it has rendered
+    table_rows: List[int] = []
+    row_cells: int = 0
+    cell_depth: int = 0
+    pre_depth: int = 0
+    code_depth: int = 0
+
+    def at_line_start() -> bool:
+        return not out or out[-1].endswith("\n")
+
+    def trailing_newlines() -> int:
+        count = 0
+        for piece in reversed(out):
+            stripped = piece.rstrip("\n")
+            count += len(piece) - len(stripped)
+            if stripped:
+                break
+        return count
+
+    def newlines(count: int):
+        """End the current line, leaving at least ``count`` line breaks."""
+        if not out:
+            return
+        out[-1] = out[-1].rstrip(" ")
+        missing = count - trailing_newlines()
+        if missing > 0:
+            out.append("\n" * missing)
+
+    def block(count: int):
+        """Start a block on a new line, unless it opens a list item"""
+        if len(out) != item_start:
+            newlines(count)
+
+    def space():
+        if out and not out[-1].endswith((" ", "\n")):
+            out.append(" ")
+
+    def emit(piece: str):
+        """Append ``piece``, indented to the list item it continues, if any"""
+        if list_columns and at_line_start():
+            piece = " " * list_columns[-1] + piece
+        out.append(piece)
+
+    def text(value: str):
+        if not value:
+            return
+        if pre_depth:
+            if list_columns:
+                # Keep the code lines inside the list item
+                indent = " " * list_columns[-1]
+                value = value.replace("\n", "\n" + indent)
+                if at_line_start():
+                    value = indent + value
+            out.append(value)
+            return
+        value = _WHITESPACE_RE.sub(" ", value)
+        if not code_depth:
+            value = _ESCAPE_RE.sub(r"\\\1", value)
+        if value.startswith(" "):
+            if emphasis_starts and emphasis_starts[-1] == len(out) - 1:
+                # Keep leading spaces outside the markers: "and **bold**"
+                start = emphasis_starts[-1]
+                before = out[start - 1] if start else "\n"
+                if not out[start].startswith(" ") and not before.endswith((" ", "\n")):
+                    out[start] = " " + out[start]
+                value = value.lstrip(" ")
+            elif at_line_start() or out[-1].endswith(" "):
+                value = value.lstrip(" ")
+        if value:
+            emit(value)
+
+    # Explicit stack instead of recursion: ("open", el), ("close", el) or
+    # ("text", str) items, pushed in reverse order of processing. Text items
+    # are told apart with isinstance, which also narrows the type for mypy.
+    stack: List[_StackItem] = [("open", root)]
+    while stack:
+        action, item = stack.pop()
+
+        if isinstance(item, str):
+            text(item)
+            continue
+
+        tag: Optional[str] = item.tag if isinstance(item.tag, str) else None
+
+        if action == "close":
+            if tag in _HEADING_LEVELS:
+                newlines(2)
+            elif tag in _EMPHASIS:
+                marker = _EMPHASIS[tag]
+                start = emphasis_starts.pop()
+                if start == len(out) - 1:
+                    # Nothing inside: drop the opening marker, keep any space
+                    out[-1] = out[-1][: -len(marker)]
+                    if not out[-1]:
+                        out.pop()
+                elif out[-1].endswith(" "):
+                    # Keep trailing spaces outside the markers: "**bold** and"
+                    out[-1] = out[-1].rstrip(" ")
+                    out.append(marker + " ")
+                else:
+                    out.append(marker)
+            elif tag == "a":
+                out.append(f"]({item.get('href')})")
+            elif tag == "code" and not pre_depth:
+                code_depth -= 1
+                out.append("`")
+            elif tag == "pre":
+                pre_depth -= 1
+                newlines(1)
+                emit("```")
+                newlines(2)
+            elif tag in ("ul", "ol"):
+                list_ordered.pop()
+                list_starts.pop()
+                list_counts.pop()
+                list_columns.pop()
+                newlines(1 if list_ordered else 2)
+            elif tag == "blockquote":
+                start = min(quote_starts.pop(), len(out))
+                prefix = " " * list_columns[-1] if list_columns else ""
+                body = _quote("".join(out[start:]), prefix)
+                del out[start:]
+                if body.replace(">", "").strip():
+                    emit(body)
+                newlines(2)
+            elif tag in _CELL_TAGS:
+                cell_depth -= 1
+                if out[-1] != " ":
+                    out[-1] = out[-1].rstrip(" ")
+                out.append(" |")
+                row_cells += 1
+            elif tag == "tr":
+                newlines(1)
+                if table_rows and table_rows[-1] == 0:
+                    # Markdown tables need a header row: use the first one
+                    emit("|" + " --- |" * row_cells)
+                    newlines(1)
+                if table_rows:
+                    table_rows[-1] += 1
+            elif tag == "table":
+                table_rows.pop()
+                newlines(2)
+            elif tag in _BLOCK_TAGS:
+                if cell_depth:
+                    space()
+                elif len(out) != item_start:
+                    newlines(2)
+            continue
+
+        # Tail text follows the element, so it is pushed first (popped last)
+        if item is not root and item.tail:
+            stack.append(("text", item.tail))
+        if tag is None or tag in _SKIPPED_TAGS:
+            continue
+
+        if tag in _HEADING_LEVELS:
+            block(2)
+            emit("#" * _HEADING_LEVELS[tag] + " ")
+        elif tag in _EMPHASIS:
+            emphasis_starts.append(len(out))
+            emit(_EMPHASIS[tag])
+        elif tag == "a":
+            if item.get("href"):
+                emit("[")
+            else:
+                tag = None  # no link syntax to close
+        elif tag == "code" and not pre_depth:
+            code_depth += 1
+            emit("`")
+        elif tag == "pre":
+            block(2)
+            emit("```\n")
+            pre_depth += 1
+        elif tag in ("ul", "ol"):
+            newlines(1 if list_ordered else 2)
+            list_ordered.append(tag == "ol")
+            try:
+                list_starts.append(int(item.get("start") or 1))
+            except ValueError:
+                list_starts.append(1)
+            list_counts.append(0)
+            list_columns.append(list_columns[-1] if list_columns else 0)
+        elif tag == "li":
+            if list_counts and list_counts[-1]:
+                # Blocks in the previous item leave a blank line; items of
+                # one list stay on consecutive lines
+                while out and not out[-1].strip("\n"):
+                    out.pop()
+            newlines(1)
+            indent = list_columns[-2] if len(list_columns) > 1 else 0
+            marker = "- "
+            if list_ordered:
+                list_counts[-1] += 1
+                if list_ordered[-1]:
+                    marker = f"{list_starts[-1] + list_counts[-1] - 1}. "
+                list_columns[-1] = indent + len(marker)
+            out.append(" " * indent + marker)
+            item_start = len(out)
+        elif tag == "br":
+            if cell_depth:
+                space()
+            else:
+                # Hard line break, as markdownify renders it
+                if out:
+                    out[-1] = out[-1].rstrip(" ")
+                out.append("  \n")
+        elif tag == "hr":
+            block(2)
+            emit("---")
+            newlines(2)
+        elif tag == "blockquote":
+            block(2)
+            quote_starts.append(len(out))
+        elif tag == "table":
+            block(2)
+            table_rows.append(0)
+        elif tag == "tr":
+            block(1)
+            emit("|")
+            row_cells = 0
+        elif tag in _CELL_TAGS:
+            cell_depth += 1
+            out.append(" ")
+        elif tag in _BLOCK_TAGS:
+            if cell_depth:
+                space()
+            else:
+                block(2)
+
+        if tag is not None:
+            stack.append(("close", item))
+        stack.extend(("open", child) for child in item.iterchildren(reversed=True))
+        if item.text:
+            stack.append(("text", item.text))
+
+    return "".join(out)
@@ -0,0 +1,133 @@
+import aiohttp
+import asyncio
+import logging
+import random
+import time
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimitedFetcher:
+    """
+    Wraps aiohttp GET requests with a per-host concurrency cap, optional
+    per-host pacing (``rps``), per-host back-off driven by rate-limit headers
+    and exponential-backoff retries on transient failures (429 / 5xx /
+    connection errors).
+    """
+
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+    def __init__(
+        self,
+        max_attempts: int = 5,
+        per_host_concurrency: int = 8,
+        max_backoff: float = 60.0,
+        rps: Optional[float] = None,
+    ):
+        self.max_attempts = max_attempts
+        self.per_host_concurrency = per_host_concurrency
+        self.max_backoff = max_backoff
+        # Minimum spacing between request starts to the same host, if paced
+        self.min_interval = 1.0 / rps if rps else 0.0
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        # Earliest time.monotonic() at which the next request to a host may start
+        self.next_allowed_ts: Dict[str, float] = {}
+
+    @asynccontextmanager
+    async def get(self, session: aiohttp.ClientSession, url: str, **kwargs):
+        """
+        Async context manager yielding the aiohttp response for ``url``.
+        Retryable statuses are retried up to ``max_attempts`` times; the last
+        response is yielded as-is so callers keep their own status handling.
+        """
+        host = urlsplit(url).netloc
+        semaphore = self._semaphores.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.per_host_concurrency)
+            self._semaphores[host] = semaphore
+
+        async with semaphore:
+            for attempt in range(self.max_attempts):
+                await self._wait_for_host(host)
+                last_attempt = attempt == self.max_attempts - 1
+
+                try:
+                    response = await session.get(url, **kwargs)
+                except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                    if last_attempt:
+                        raise
+                    delay = self._backoff(attempt)
+                    logger.warning(
+                        f"Request to {host} failed ({e!r}), retrying in {delay:.1f}s"
+                    )
+                    await asyncio.sleep(delay)
+                    continue
+
+                if response.status in self.RETRY_STATUSES and not last_attempt:
+                    delay = self._retry_after(response)
+                    if delay is None:
+                        delay = self._backoff(attempt)
+                    logger.warning(
+                        f"{host} returned HTTP {response.status}, retrying in {delay:.1f}s"
+                    )
+                    self._defer_host(host, delay)
+                    response.release()
+                    continue
+
+                self._update_from_headers(host, response)
+                try:
+                    yield response
+                finally:
+                    response.release()
+                return
+
+    async def _wait_for_host(self, host: str):
+        now = time.monotonic()
+        start = max(now, self.next_allowed_ts.get(host, 0.0))
+        if self.min_interval:
+            # Reserve this slot before sleeping so concurrent callers queue up
+            self.next_allowed_ts[host] = start + self.min_interval
+        delay = start - now
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    def _defer_host(self, host: str, delay: float):
+        until = time.monotonic() + delay
+        self.next_allowed_ts[host] = max(self.next_allowed_ts.get(host, 0.0), until)
+
+    def _backoff(self, attempt: int) -> float:
+        return min(2**attempt + random.random(), self.max_backoff)
+
+    def _retry_after(self, response: aiohttp.ClientResponse) -> Optional[float]:
+        """Seconds to wait according to a Retry-After header (delta or HTTP date)."""
+        value = response.headers.get("Retry-After")
+        if not value:
+            return None
+        try:
+            delay = float(value)
+        except ValueError:
+            try:
+                delay = parsedate_to_datetime(value).timestamp() - time.time()
+            except (TypeError, ValueError):
+                return None
+        return min(max(delay, 0.0), self.max_backoff)
+
+    def _update_from_headers(self, host: str, response: aiohttp.ClientResponse):
+        """Hold back a host whose rate-limit budget is exhausted until it resets."""
+        if response.headers.get("X-RateLimit-Remaining") != "0":
+            return
+
+        reset = response.headers.get("X-RateLimit-Reset")
+        try:
+            reset_value = float(reset)
+        except (TypeError, ValueError):
+            return
+
+        # Some APIs send an epoch timestamp, others the seconds left in the window
+        delay = reset_value - time.time() if reset_value > 1e9 else reset_value
+        if delay > 0:
+            self._defer_host(host, min(delay, self.max_backoff))